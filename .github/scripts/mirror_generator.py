@@ -1,10 +1,20 @@
 
 import json
-import requests
 import os
+import sys
 import urllib.parse
 import shutil
 import msgpack
+try:
+    import orjson  # optional: ~2x faster decode of the releases payloads
+except ImportError:
+    orjson = None
+from packed_manifest import PACKED_MANIFEST_FILE, write_manifest
+
+# Shared helpers live next to the scraper in /scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "scripts"))
+from metrics import metrics  # noqa: E402
+from transport import create_session  # noqa: E402
 
 # Files
 APPS_FILE = "apps.json"
@@ -12,6 +22,9 @@ MIRROR_FILE = "mirror.json"
 MIRRORS_DIR = "mirrors"
 BINARY_MANIFEST_FILE = "updates.bin"
 
+# APIs (overridable so benchmarks can point at a local fake)
+GITHUB_API_URL = "https://api.github.com"
+
 def minify_release(release):
     """
     THIN MIRROR PROTOCOL
@@ -58,36 +71,40 @@ def minify_release(release):
         "assets": minified_assets
     }
 
-def generate_mirror():
-    # 1. Setup & Cleanup
-    print("🧹 Cleaning mirrors directory...")
-    if os.path.exists(MIRRORS_DIR):
-        shutil.rmtree(MIRRORS_DIR)
-    os.makedirs(MIRRORS_DIR)
+def decode_releases(raw):
+    """
+    Decode a releases API body straight from bytes and apply minify_release.
+    Uses orjson when installed (no str copy, C decoder), stdlib json otherwise.
+    """
+    data = orjson.loads(raw) if orjson else json.loads(raw)
+    if isinstance(data, list):
+        return [minify_release(release) for release in data]
+    return minify_release(data)
 
-    gh_headers = {}
-    if os.environ.get("GH_TOKEN"):
-        gh_headers["Authorization"] = f"Bearer {os.environ.get('GH_TOKEN')}"
-    gh_headers["User-Agent"] = "OrionStore-Nuclear/1.1"
-
-    if not os.path.exists(APPS_FILE):
-        print(f"❌ Error: {APPS_FILE} not found.")
-        return
+def load_apps(path=APPS_FILE):
+    """Read apps.json; prints the problem and returns None if it can't."""
+    if not os.path.exists(path):
+        print(f"❌ Error: {path} not found.")
+        return None
 
     try:
-        with open(APPS_FILE, "r", encoding="utf-8") as f:
-            apps = json.load(f)
+        with metrics.timer("load_apps"):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
     except Exception as e:
         print(f"❌ Error reading apps.json: {e}")
-        return
+        return None
 
-    # 2. Fetch Data (Deduplicated)
-    repo_cache = {} 
+def resolve_repos(apps):
+    """
+    Work out which repo backs each app.
+    Returns (unique_repos, app_to_repo_map):
+      unique_repos    set of (unique_key, repo_path, source_type, domain)
+      app_to_repo_map app id -> unique_key
+    """
     unique_repos = set()
     app_to_repo_map = {} 
 
-    print(f"🔍 Analyzing {len(apps)} apps for data sources...")
-
     for app in apps:
         repo_key = None
         source_type = None # 'github' or 'gitlab'
@@ -122,21 +139,40 @@ def generate_mirror():
             unique_repos.add((unique_key, repo_key, source_type, domain))
             app_to_repo_map[app['id']] = unique_key
 
-    # 3. Fetching Phase
-    print(f"📡 Detected {len(unique_repos)} unique repositories. Starting fetch & minify...")
+    return unique_repos, app_to_repo_map
+
+def fetch_repos(unique_repos, github_api_url=GITHUB_API_URL, gitlab_api_url=None):
+    """
+    Fetch + minify releases for every repo.
+    Returns repo_cache keyed by both unique_key and repo_path; repos that failed
+    or returned nothing are left out.
+    """
+    repo_cache = {} 
+
+    # Token only goes to GitHub; the pooled session is shared with GitLab hosts
+    gh_headers = {}
+    if os.environ.get("GH_TOKEN"):
+        gh_headers["Authorization"] = f"Bearer {os.environ.get('GH_TOKEN')}"
+    session = create_session(headers={"User-Agent": "OrionStore-Nuclear/1.1"})
+    gh_host = urllib.parse.urlsplit(github_api_url).hostname
 
     for u_key, repo_path, s_type, s_domain in unique_repos:
-        if u_key in repo_cache: continue
+        if u_key in repo_cache:
+            # Same repo spelled differently by another app: no second request
+            metrics.incr("repo_cache_hits", kind="fetch", source=s_type)
+            continue
 
         print(f"⬇️ Fetching {s_type.title()}: {repo_path}...")
         
         try:
             data = None
             if s_type == 'github':
-                url = f"https://api.github.com/repos/{repo_path}/releases?per_page=20"
-                r = requests.get(url, headers=gh_headers)
+                url = f"{github_api_url}/repos/{repo_path}/releases?per_page=20"
+                with metrics.timer("fetch", host=gh_host):
+                    r = session.get(url, headers=gh_headers)
                 if r.status_code == 200:
-                    data = r.json()
+                    with metrics.timer("parse"):
+                        data = decode_releases(r.content)
                 elif r.status_code == 404:
                     print(f"   ⚠️ Repo not found: {repo_path}")
                 elif r.status_code == 403:
@@ -144,19 +180,19 @@ def generate_mirror():
             
             elif s_type == 'gitlab':
                 encoded_path = urllib.parse.quote(repo_path, safe='')
-                url = f"https://{s_domain}/api/v4/projects/{encoded_path}/releases"
-                r = requests.get(url, timeout=20)
+                gl_base = gitlab_api_url or f"https://{s_domain}"
+                url = f"{gl_base}/api/v4/projects/{encoded_path}/releases"
+                with metrics.timer("fetch", host=urllib.parse.urlsplit(url).hostname):
+                    r = session.get(url, timeout=20)
                 if r.status_code == 200:
-                    data = r.json()
+                    with metrics.timer("parse"):
+                        data = decode_releases(r.content)
                 else:
                     print(f"   ⚠️ GitLab Error {r.status_code}: {repo_path}")
 
             if data:
-                # APPLY THIN MIRROR PROTOCOL
-                if isinstance(data, list):
-                    minified_data = [minify_release(r) for r in data]
-                else:
-                    minified_data = minify_release(data)
+                # Already minified by decode_releases (THIN MIRROR PROTOCOL)
+                minified_data = data
                 
                 # Check if empty list returned (repo exists but no releases)
                 if not minified_data:
@@ -166,9 +202,12 @@ def generate_mirror():
                 repo_cache[repo_path] = minified_data 
 
         except Exception as e:
+            metrics.incr("fetch_errors", source=s_type)
             print(f"   ❌ Network Error: {e}")
 
-    # --- NEW: MISSING APPS AUDIT REPORT ---
+    return repo_cache
+
+def print_audit_report(apps, app_to_repo_map, repo_cache):
     print("\n" + "="*50)
     print("🕵️  MISSING APPS AUDIT REPORT")
     print("="*50)
@@ -207,54 +246,66 @@ def generate_mirror():
         print("   Apps listed above will display 'Varies' or 'Latest' in the store.")
         print("   Action: Check repo URLs, verify Releases exist, or check GitHub Status.")
     print("="*50 + "\n")
-    # --------------------------------------
 
-    # 4. Generate Monolithic File (Legacy)
-    print("💾 Saving legacy mirror.json...")
-    legacy_data = {k: v for k, v in repo_cache.items() if "::" not in k and v} 
+def write_legacy_mirror(repo_cache, path=MIRROR_FILE):
+    # Sorted so the file doesn't depend on set iteration order (hash seed, partitioning)
+    legacy_data = {k: repo_cache[k] for k in sorted(repo_cache) if "::" not in k and repo_cache[k]}
     try:
-        with open(MIRROR_FILE, "w", encoding="utf-8") as f:
-            json.dump(legacy_data, f, indent=None, separators=(',', ':'))
+        with metrics.timer("write_mirror"):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(legacy_data, f, indent=None, separators=(',', ':'))
+        metrics.incr("bytes_written", os.path.getsize(path), output="mirror.json")
     except Exception as e:
         print(f"❌ Error writing mirror.json: {e}")
 
-    # 5. Generate Atomic Shards
-    print("⚛️ Generating Atomic Shards...")
+def shard_path(app):
+    """Shard location relative to the mirrors dir (e.g. c/o/com.foo.json), or None."""
+    identifier = app.get('packageName') or app.get('id')
+    if not identifier:
+        return None
+    identifier = identifier.lower().strip()
+    safe_name = "".join([c for c in identifier if c.isalnum() or c in "._-"])
+    char1 = safe_name[0] if len(safe_name) > 0 else "_"
+    char2 = safe_name[1] if len(safe_name) > 1 else "_"
+    return os.path.join(char1, char2, f"{safe_name}.json")
+
+def write_shards(apps, app_to_repo_map, repo_cache, mirrors_dir=MIRRORS_DIR):
+    """Write one shard per app with live data. Returns the number written."""
     shard_count = 0
-    
-    # 6. Generate Binary Manifest (The Nuclear Option)
-    print("☢️ Generating Binary Manifest...")
-    manifest = {} # Map: AppID -> Version
-    
+    served = set()
+    for app in apps:
+        unique_key = app_to_repo_map.get(app.get('id'))
+        if not (unique_key and unique_key in repo_cache and repo_cache[unique_key]):
+            continue
+        if unique_key in served:
+            # Several apps share one repo: its releases were fetched once
+            metrics.incr("repo_cache_hits", kind="app")
+        served.add(unique_key)
+        relative = shard_path(app)
+        if not relative:
+            continue
+
+        target_file = os.path.join(mirrors_dir, relative)
+        os.makedirs(os.path.dirname(target_file), exist_ok=True)
+        try:
+            with metrics.timer("write_shard"):
+                with open(target_file, "w", encoding="utf-8") as f:
+                    json.dump(repo_cache[unique_key], f, separators=(',', ':'))
+                    metrics.incr("bytes_written", f.tell(), output="shards")
+            shard_count += 1
+        except: pass
+    return shard_count
+
+def build_manifest(apps, app_to_repo_map, repo_cache):
+    """Map: AppID -> Version. Priority: Live Data > Config Data > Fallback"""
+    manifest = {}
     for app in apps:
         app_id = app.get('id')
-        
-        # --- Shard Generation Logic ---
         unique_key = app_to_repo_map.get(app_id)
-        
-        # Determine latest version for Manifest
-        # Priority: Live Data > Config Data > Fallback
+
         live_version = None
         if unique_key and unique_key in repo_cache and repo_cache[unique_key]:
             cached_data = repo_cache[unique_key]
-            # Write Shard
-            identifier = app.get('packageName') or app.get('id')
-            if identifier:
-                identifier = identifier.lower().strip()
-                safe_name = "".join([c for c in identifier if c.isalnum() or c in "._-"])
-                char1 = safe_name[0] if len(safe_name) > 0 else "_"
-                char2 = safe_name[1] if len(safe_name) > 1 else "_"
-                
-                target_dir = os.path.join(MIRRORS_DIR, char1, char2)
-                os.makedirs(target_dir, exist_ok=True)
-                target_file = os.path.join(target_dir, f"{safe_name}.json")
-                
-                try:
-                    with open(target_file, "w", encoding="utf-8") as f:
-                        json.dump(cached_data, f, separators=(',', ':'))
-                    shard_count += 1
-                except: pass
-
             # Extract Version for Manifest
             if isinstance(cached_data, list) and len(cached_data) > 0:
                 live_version = cached_data[0].get('tag_name')
@@ -266,17 +317,70 @@ def generate_mirror():
         
         if app_id:
             manifest[app_id] = final_version
+    return manifest
 
+def write_binary_manifests(manifest):
     # Write Binary Manifest
     try:
-        with open(BINARY_MANIFEST_FILE, "wb") as f:
-            f.write(msgpack.packb(manifest))
+        with metrics.timer("write_manifest"):
+            with open(BINARY_MANIFEST_FILE, "wb") as f:
+                f.write(msgpack.packb(manifest))
         print(f"   ✅ Saved {BINARY_MANIFEST_FILE} ({len(manifest)} entries)")
     except Exception as e:
         print(f"   ❌ Failed to write binary manifest: {e}")
 
+    # Write Packed Manifest (sorted, mmap-friendly twin of updates.bin)
+    try:
+        with metrics.timer("write_packed_manifest"):
+            write_manifest(manifest, PACKED_MANIFEST_FILE)
+        print(f"   ✅ Saved {PACKED_MANIFEST_FILE} ({len(manifest)} entries)")
+    except Exception as e:
+        print(f"   ❌ Failed to write packed manifest: {e}")
+
+def reset_mirrors_dir(path=MIRRORS_DIR):
+    print("🧹 Cleaning mirrors directory...")
+    if os.path.exists(path):
+        shutil.rmtree(path)
+    os.makedirs(path)
+
+def generate_mirror(github_api_url=GITHUB_API_URL, gitlab_api_url=None):
+    """
+    github_api_url: base URL for GitHub release lookups
+    gitlab_api_url: base URL for every GitLab lookup (default: https://<app's gitlab domain>)
+    """
+    # 1. Setup & Cleanup
+    reset_mirrors_dir()
+
+    apps = load_apps()
+    if apps is None:
+        return
+
+    # 2. Fetch Data (Deduplicated)
+    print(f"🔍 Analyzing {len(apps)} apps for data sources...")
+    unique_repos, app_to_repo_map = resolve_repos(apps)
+
+    # 3. Fetching Phase
+    print(f"📡 Detected {len(unique_repos)} unique repositories. Starting fetch & minify...")
+    repo_cache = fetch_repos(unique_repos, github_api_url, gitlab_api_url)
+
+    print_audit_report(apps, app_to_repo_map, repo_cache)
+
+    # 4. Generate Monolithic File (Legacy)
+    print("💾 Saving legacy mirror.json...")
+    write_legacy_mirror(repo_cache)
+
+    # 5. Generate Atomic Shards
+    print("⚛️ Generating Atomic Shards...")
+    shard_count = write_shards(apps, app_to_repo_map, repo_cache)
+    
+    # 6. Generate Binary Manifest (The Nuclear Option)
+    print("☢️ Generating Binary Manifest...")
+    write_binary_manifests(build_manifest(apps, app_to_repo_map, repo_cache))
+
     print("--------------------------------")
     print(f"🎉 Success! Generated {shard_count} thin shards + 1 binary manifest.")
+    metrics.incr("shards_written", shard_count)
+    metrics.finish("mirror_generator")
 
 if __name__ == "__main__":
     generate_mirror()
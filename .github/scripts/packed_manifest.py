@@ -0,0 +1,177 @@
+import mmap
+import os
+import re
+import struct
+
+# Files
+PACKED_MANIFEST_FILE = "updates.idx"
+
+# Layout (little endian, version 3)
+# ---------------------------------
+#   header   : magic, format version, flags, entry count, string pool offset,
+#              string pool length (offset + length == file size)
+#   records  : one fixed-width record per app, sorted by UTF-8 app ID bytes
+#   strings  : UTF-8 pool holding every app ID and version string
+#
+# A record is (id offset, id length, version offset, version length,
+# 4 x u32 numeric version parts). Offsets are relative to the string pool.
+MAGIC = b"ORPM"
+FORMAT_VERSION = 3
+HEADER = struct.Struct("<4sHHIII")
+RECORD = struct.Struct("<IHIH4I")
+VERSION_PARTS = 4
+VERSION_PART_MAX = 0xFFFFFFFF
+
+_NUMERIC_RE = re.compile(r"\d+")
+
+
+def pack_version(version):
+    """
+    Turns a version string ('v1.2.3', '2.99.374-beta') into a fixed
+    4-tuple of ints so clients can compare versions without parsing.
+    Missing parts are 0, parts above 0xFFFFFFFF are clamped.
+    """
+    parts = [min(int(p), VERSION_PART_MAX) for p in _NUMERIC_RE.findall(str(version or ""))]
+    parts = parts[:VERSION_PARTS]
+    return tuple(parts + [0] * (VERSION_PARTS - len(parts)))
+
+
+def pack_manifest(manifest):
+    """Serialize an {app_id: version} dict into the packed binary layout."""
+    entries = sorted(
+        (str(app_id).encode("utf-8"), str(version if version is not None else "").encode("utf-8"), version)
+        for app_id, version in manifest.items()
+    )
+
+    records = bytearray()
+    pool = bytearray()
+    for id_bytes, ver_bytes, version in entries:
+        id_off = len(pool)
+        pool += id_bytes
+        ver_off = len(pool)
+        pool += ver_bytes
+        records += RECORD.pack(id_off, len(id_bytes), ver_off, len(ver_bytes), *pack_version(version))
+
+    pool_offset = HEADER.size + len(records)
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(entries), pool_offset, len(pool))
+    return bytes(header) + bytes(records) + bytes(pool)
+
+
+def write_manifest(manifest, path=PACKED_MANIFEST_FILE):
+    """Write the packed manifest to disk (via a temp file, so readers never see a torn file)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(pack_manifest(manifest))
+    os.replace(tmp_path, path)
+    return path
+
+
+class PackedManifest:
+    """
+    Memory-mapped reader for updates.idx.
+    Lookups binary search the sorted record table in place; nothing is
+    decoded until a matching entry is found.
+    """
+
+    def __init__(self, path=PACKED_MANIFEST_FILE):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # mmap refuses empty files
+            self._file.close()
+            raise ValueError(f"{path} is empty")
+        self._view = memoryview(self._mm)
+
+        size = len(self._mm)
+        if size < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is truncated ({size} bytes, header needs {HEADER.size})")
+
+        magic, version, _flags, count, pool_offset, pool_len = HEADER.unpack_from(self._view, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a packed manifest (bad magic {magic!r})")
+        if version != FORMAT_VERSION:
+            self.close()
+            raise ValueError(f"{path} uses unsupported format version {version}")
+        if pool_offset != HEADER.size + count * RECORD.size or pool_offset + pool_len != size:
+            self.close()
+            raise ValueError(f"{path} is truncated ({size} bytes, header describes {pool_offset + pool_len})")
+
+        self._count = count
+        self._pool = pool_offset
+
+    # --- Internals ---
+    def _record(self, index):
+        return RECORD.unpack_from(self._view, HEADER.size + index * RECORD.size)
+
+    def _string(self, offset, length):
+        start = self._pool + offset
+        return self._mm[start:start + length]
+
+    def _find(self, app_id):
+        key = app_id.encode("utf-8") if isinstance(app_id, str) else bytes(app_id)
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = self._record(mid)
+            current = self._string(record[0], record[1])
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return record
+        return None
+
+    # --- Public API ---
+    def get(self, app_id, default=None):
+        record = self._find(app_id)
+        if record is None:
+            return default
+        return self._string(record[2], record[3]).decode("utf-8")
+
+    def version_tuple(self, app_id):
+        record = self._find(app_id)
+        return tuple(record[4:]) if record is not None else None
+
+    def ids(self):
+        for i in range(self._count):
+            record = self._record(i)
+            yield self._string(record[0], record[1]).decode("utf-8")
+
+    def items(self):
+        for i in range(self._count):
+            record = self._record(i)
+            yield (
+                self._string(record[0], record[1]).decode("utf-8"),
+                self._string(record[2], record[3]).decode("utf-8"),
+            )
+
+    def __getitem__(self, app_id):
+        record = self._find(app_id)
+        if record is None:
+            raise KeyError(app_id)
+        return self._string(record[2], record[3]).decode("utf-8")
+
+    def __contains__(self, app_id):
+        return self._find(app_id) is not None
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        if self._view is not None:
+            self._view.release()
+            self._view = None
+        if not self._mm.closed:
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
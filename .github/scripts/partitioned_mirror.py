@@ -0,0 +1,257 @@
+"""
+PARTITIONED MIRROR RUNS
+-----------------------
+Splits the repo set into N partitions by a stable hash of each repo's
+unique_key, so independent processes or CI runners can fetch them in
+parallel, then merges the partial results into the usual outputs
+(mirrors/, mirror.json, updates.bin, updates.idx).
+
+    # one partition (e.g. one job of a CI matrix)
+    python partitioned_mirror.py --partitions 4 --partition 2
+    # after every partition finished
+    python partitioned_mirror.py --partitions 4 --merge
+    # everything on this machine with a process pool
+    python partitioned_mirror.py --partitions 4 --local
+
+Each partition writes partitions/part-<i>-of-<n>/ holding the shards for
+the apps whose repo it owns plus partial.json (fetched releases per repo).
+The merge refuses to write anything unless all partitions are present, were
+built from the same apps.json and together cover every repo.
+"""
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import shutil
+import sys
+
+from mirror_generator import (
+    GITHUB_API_URL,
+    MIRRORS_DIR,
+    build_manifest,
+    fetch_repos,
+    load_apps,
+    print_audit_report,
+    reset_mirrors_dir,
+    resolve_repos,
+    shard_path,
+    write_binary_manifests,
+    write_legacy_mirror,
+    write_shards,
+)
+from metrics import metrics
+
+PARTITIONS_DIR = "partitions"
+PARTIAL_FILE = "partial.json"
+PARTIAL_FORMAT = 1
+
+
+class PartitionMergeError(Exception):
+    """Partial results are missing, stale or don't cover the catalog."""
+
+
+def partition_of(unique_key, partitions):
+    """Stable across processes and machines (unlike hash())."""
+    digest = hashlib.sha1(unique_key.encode("utf-8")).hexdigest()
+    return int(digest[:16], 16) % partitions
+
+
+def catalog_fingerprint(apps):
+    return hashlib.sha256(json.dumps(apps, sort_keys=True, separators=(',', ':')).encode("utf-8")).hexdigest()
+
+
+def partition_dir(index, partitions, root=PARTITIONS_DIR):
+    return os.path.join(root, f"part-{index}-of-{partitions}")
+
+
+def run_partition(index, partitions, root=PARTITIONS_DIR, github_api_url=GITHUB_API_URL, gitlab_api_url=None):
+    """Fetch this partition's repos and write its shards + partial.json. Returns the partial dir."""
+    if not 0 <= index < partitions:
+        raise ValueError(f"partition {index} out of range for {partitions} partitions")
+
+    apps = load_apps()
+    if apps is None:
+        return None
+
+    unique_repos, app_to_repo_map = resolve_repos(apps)
+    mine = {repo for repo in unique_repos if partition_of(repo[0], partitions) == index}
+    print(f"🧩 Partition {index + 1}/{partitions}: {len(mine)} of {len(unique_repos)} repositories")
+
+    repo_cache = fetch_repos(mine, github_api_url, gitlab_api_url)
+
+    out_dir = partition_dir(index, partitions, root)
+    if os.path.exists(out_dir):
+        shutil.rmtree(out_dir)
+    os.makedirs(out_dir)
+
+    my_apps = [
+        app for app in apps
+        if app.get('id') in app_to_repo_map and partition_of(app_to_repo_map[app['id']], partitions) == index
+    ]
+    shard_count = write_shards(my_apps, app_to_repo_map, repo_cache, os.path.join(out_dir, MIRRORS_DIR))
+
+    # Failed / empty repos are recorded too (releases = null) so the merge can
+    # tell "fetched, nothing there" from "this partition never ran"
+    repos = {}
+    for u_key, repo_path, _, _ in sorted(mine):
+        entry = repos.setdefault(u_key, {"releases": repo_cache.get(u_key), "repo_paths": []})
+        if repo_path in repo_cache:
+            entry["repo_paths"].append(repo_path)
+
+    with open(os.path.join(out_dir, PARTIAL_FILE), "w", encoding="utf-8") as f:
+        json.dump({
+            "format": PARTIAL_FORMAT,
+            "partition": index,
+            "partitions": partitions,
+            "catalog_sha256": catalog_fingerprint(apps),
+            "shards": shard_count,
+            "repos": repos,
+        }, f, separators=(',', ':'))
+
+    print(f"✅ Partition {index + 1}/{partitions}: {shard_count} shards -> {out_dir}")
+    metrics.incr("shards_written", shard_count)
+    metrics.finish(f"mirror_partition_{index}")
+    return out_dir
+
+
+def _load_partials(partitions, root, fingerprint):
+    partials = []
+    problems = []
+    for index in range(partitions):
+        path = os.path.join(partition_dir(index, partitions, root), PARTIAL_FILE)
+        if not os.path.exists(path):
+            problems.append(f"partition {index}: {path} missing")
+            partials.append(None)
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            partial = json.load(f)
+        if partial.get("format") != PARTIAL_FORMAT:
+            problems.append(f"partition {index}: unsupported format {partial.get('format')}")
+        elif (partial.get("partition"), partial.get("partitions")) != (index, partitions):
+            problems.append(f"partition {index}: file claims {partial.get('partition')}/{partial.get('partitions')}")
+        elif partial.get("catalog_sha256") != fingerprint:
+            problems.append(f"partition {index}: built from a different apps.json")
+        partials.append(partial)
+    return partials, problems
+
+
+def _link_or_copy(source, target):
+    """Leave the partial shard in place so the merge can be re-run on the same partitions."""
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
+
+
+def merge_partitions(partitions, root=PARTITIONS_DIR):
+    """
+    Validate all partials and assemble mirrors/, mirror.json, updates.bin and updates.idx.
+    Raises PartitionMergeError (before touching any output) if anything is missing.
+    """
+    apps = load_apps()
+    if apps is None:
+        raise PartitionMergeError("apps.json could not be loaded")
+
+    unique_repos, app_to_repo_map = resolve_repos(apps)
+    partials, problems = _load_partials(partitions, root, catalog_fingerprint(apps))
+
+    # Every repo in the catalog must be reported by exactly the partition that owns it
+    repo_cache = {}
+    for u_key in sorted({repo[0] for repo in unique_repos}):
+        owner = partition_of(u_key, partitions)
+        partial = partials[owner]
+        if partial is None:
+            continue  # already reported as missing
+        entry = partial["repos"].get(u_key)
+        if entry is None:
+            problems.append(f"partition {owner}: no result for {u_key}")
+            continue
+        if entry["releases"]:
+            repo_cache[u_key] = entry["releases"]
+            for repo_path in entry["repo_paths"]:
+                repo_cache[repo_path] = entry["releases"]
+
+    # Shard owners in catalog order, so a name clash resolves like a single run (last app wins)
+    shard_sources = {}
+    for app in apps:
+        unique_key = app_to_repo_map.get(app.get('id'))
+        relative = shard_path(app)
+        if unique_key and relative and repo_cache.get(unique_key):
+            shard_sources[relative] = partition_of(unique_key, partitions)
+    for relative, owner in shard_sources.items():
+        if not os.path.exists(os.path.join(partition_dir(owner, partitions, root), MIRRORS_DIR, relative)):
+            problems.append(f"partition {owner}: shard {relative} missing")
+
+    if problems:
+        shown = "\n".join(f"   - {p}" for p in problems[:20])
+        more = f"\n   ... and {len(problems) - 20} more" if len(problems) > 20 else ""
+        raise PartitionMergeError(f"{len(problems)} problem(s) in partial results:\n{shown}{more}")
+
+    print(f"🧩 Merging {partitions} partitions ({len(unique_repos)} repositories, {len(shard_sources)} shards)")
+    print_audit_report(apps, app_to_repo_map, repo_cache)
+
+    reset_mirrors_dir()
+    with metrics.timer("merge_shards"):
+        for relative, owner in shard_sources.items():
+            target = os.path.join(MIRRORS_DIR, relative)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            _link_or_copy(os.path.join(partition_dir(owner, partitions, root), MIRRORS_DIR, relative), target)
+
+    print("💾 Saving legacy mirror.json...")
+    write_legacy_mirror(repo_cache)
+
+    print("☢️ Generating Binary Manifest...")
+    write_binary_manifests(build_manifest(apps, app_to_repo_map, repo_cache))
+
+    print("--------------------------------")
+    print(f"🎉 Success! Merged {len(shard_sources)} thin shards + 1 binary manifest.")
+    metrics.incr("shards_written", len(shard_sources))
+    metrics.finish("mirror_merge")
+    return len(shard_sources)
+
+
+def _run_partition_job(args):
+    return run_partition(*args)
+
+
+def run_local(partitions, workers=None, root=PARTITIONS_DIR, github_api_url=GITHUB_API_URL, gitlab_api_url=None):
+    """Run every partition in a local process pool, then merge."""
+    jobs = [(index, partitions, root, github_api_url, gitlab_api_url) for index in range(partitions)]
+    with multiprocessing.Pool(processes=workers or partitions) as pool:
+        pool.map(_run_partition_job, jobs)
+    return merge_partitions(partitions, root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partitioned mirror generation")
+    parser.add_argument("--partitions", type=int, required=True, help="Total number of partitions")
+    mode = parser.add_mutually_exclusive_group(required=True)
+    mode.add_argument("--partition", type=int, help="Run a single partition (0-based)")
+    mode.add_argument("--merge", action="store_true", help="Merge finished partitions into the final outputs")
+    mode.add_argument("--local", action="store_true", help="Run all partitions in a local process pool, then merge")
+    parser.add_argument("--workers", type=int, help="Process pool size for --local (default: one per partition)")
+    parser.add_argument("--dir", default=PARTITIONS_DIR, help="Where partial results live")
+    parser.add_argument("--github-api", default=GITHUB_API_URL, help="GitHub API base URL")
+    parser.add_argument("--gitlab-api", help="GitLab API base URL (default: each app's GitLab host)")
+    args = parser.parse_args()
+
+    if args.partitions < 1:
+        parser.error("--partitions must be at least 1")
+
+    try:
+        if args.partition is not None:
+            if not 0 <= args.partition < args.partitions:
+                parser.error(f"--partition must be between 0 and {args.partitions - 1}")
+            run_partition(args.partition, args.partitions, args.dir, args.github_api, args.gitlab_api)
+        elif args.merge:
+            merge_partitions(args.partitions, args.dir)
+        else:
+            run_local(args.partitions, args.workers, args.dir, args.github_api, args.gitlab_api)
+    except PartitionMergeError as e:
+        print(f"❌ Merge aborted: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Benchmarks for the mirror data pipeline.
+
+    catalog        synthetic apps.json catalogs + release payloads
+    fake_api       local GitHub/GitLab releases API
+    local_server   threaded local HTTP server the fakes build on
+    pipeline       end-to-end generate_mirror() runs (python -m benchmarks.pipeline)
+    manifest_bench updates.bin vs updates.idx load/lookup
+    minify_bench   releases payload decode + minify paths
+"""
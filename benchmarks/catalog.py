@@ -0,0 +1,205 @@
+"""
+Synthetic apps.json catalogs and release payloads.
+
+Catalogs mimic the real store: most apps point at GitHub, a slice at GitLab
+(some self-hosted), several apps share one repo (e.g. a project shipping a
+"lite" and a "pro" build) and a few have no parsable repo at all.
+Release payloads carry the full GitHub/GitLab shape (author, uploader,
+node_ids...) so minify_release has realistic work to do.
+"""
+import hashlib
+import json
+import random
+
+GITLAB_DOMAINS = ("gitlab.com", "gitlab.com", "gitlab.com", "code.selfhosted.dev")
+
+# Fraction of apps per kind; everything else is a plain GitHub app
+SHARED_REPO_RATIO = 0.15     # apps reusing another app's repo
+GITLAB_RATIO = 0.08
+REPO_URL_RATIO = 0.25        # GitHub apps given as repoUrl instead of githubRepo
+UNPARSABLE_RATIO = 0.02      # apps without any usable repo reference
+
+# Payload variants the fake API serves (selected per repo by hash)
+PAYLOAD_VARIANTS = 64
+MISSING_REPO_RATIO = 0.02    # -> 404
+EMPTY_RELEASES_RATIO = 0.03  # -> 200 []
+
+
+def build_catalog(size, seed=1):
+    """Return a list of app dicts shaped like apps.json."""
+    rng = random.Random(seed)
+    apps = []
+    repos = []  # (kind, ref, domain) already used, for sharing
+
+    for i in range(size):
+        app = {
+            "id": f"app-{i}",
+            "name": f"Synthetic App {i}",
+            "packageName": f"com.vendor{rng.randrange(max(size // 4, 1))}.app{i}",
+            "version": f"{rng.randrange(10)}.{rng.randrange(50)}.{rng.randrange(200)}",
+        }
+        roll = rng.random()
+
+        if repos and roll < SHARED_REPO_RATIO:
+            kind, ref, domain = rng.choice(repos)
+        elif roll < SHARED_REPO_RATIO + UNPARSABLE_RATIO:
+            app["repoUrl"] = f"https://example.org/downloads/{i}"
+            apps.append(app)
+            continue
+        elif roll < SHARED_REPO_RATIO + UNPARSABLE_RATIO + GITLAB_RATIO:
+            kind, ref, domain = "gitlab", f"group{rng.randrange(500)}/project-{i}", rng.choice(GITLAB_DOMAINS)
+            repos.append((kind, ref, domain))
+        else:
+            kind, ref, domain = "github", f"owner{rng.randrange(size // 3 + 1)}/repo-{i}", "github.com"
+            repos.append((kind, ref, domain))
+
+        if kind == "github":
+            if rng.random() < REPO_URL_RATIO:
+                app["repoUrl"] = f"https://github.com/{ref}"
+            else:
+                app["githubRepo"] = ref
+        else:
+            app["gitlabRepo"] = ref
+            if domain != "gitlab.com":
+                app["gitlabDomain"] = domain
+        apps.append(app)
+
+    return apps
+
+
+def _user(rng, login):
+    uid = rng.randrange(10 ** 8)
+    return {
+        "login": login,
+        "id": uid,
+        "node_id": f"MDQ6VXNlcj{uid}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{uid}?v=4",
+        "gravatar_id": "",
+        "url": f"https://api.github.com/users/{login}",
+        "html_url": f"https://github.com/{login}",
+        "followers_url": f"https://api.github.com/users/{login}/followers",
+        "following_url": f"https://api.github.com/users/{login}/following{{/other_user}}",
+        "gists_url": f"https://api.github.com/users/{login}/gists{{/gist_id}}",
+        "starred_url": f"https://api.github.com/users/{login}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"https://api.github.com/users/{login}/subscriptions",
+        "organizations_url": f"https://api.github.com/users/{login}/orgs",
+        "repos_url": f"https://api.github.com/users/{login}/repos",
+        "events_url": f"https://api.github.com/users/{login}/events{{/privacy}}",
+        "received_events_url": f"https://api.github.com/users/{login}/received_events",
+        "type": "User",
+        "site_admin": False,
+    }
+
+
+def github_releases(rng, releases=20):
+    """A /releases?per_page=20 style payload with many assets per release."""
+    repo = "owner/repo"
+    author = _user(rng, f"dev{rng.randrange(1000)}")
+    payload = []
+    for n in range(releases):
+        rid = rng.randrange(10 ** 9)
+        tag = f"v{releases - n}.{rng.randrange(20)}.{rng.randrange(100)}"
+        assets = []
+        for a in range(rng.randint(1, 8)):
+            aid = rng.randrange(10 ** 9)
+            name = f"app-{tag}-{('arm64-v8a', 'armeabi-v7a', 'x86_64', 'universal')[a % 4]}-{a}.apk"
+            assets.append({
+                "url": f"https://api.github.com/repos/{repo}/releases/assets/{aid}",
+                "id": aid,
+                "node_id": f"RA_kwDOAbCdEf{aid}",
+                "name": name,
+                "label": "",
+                "uploader": author,
+                "content_type": "application/vnd.android.package-archive",
+                "state": "uploaded",
+                "size": rng.randrange(2 * 10 ** 6, 120 * 10 ** 6),
+                "download_count": rng.randrange(10 ** 6),
+                "created_at": "2026-01-01T00:00:00Z",
+                "updated_at": "2026-01-01T00:00:00Z",
+                "browser_download_url": f"https://github.com/{repo}/releases/download/{tag}/{name}",
+            })
+        payload.append({
+            "url": f"https://api.github.com/repos/{repo}/releases/{rid}",
+            "assets_url": f"https://api.github.com/repos/{repo}/releases/{rid}/assets",
+            "upload_url": f"https://uploads.github.com/repos/{repo}/releases/{rid}/assets{{?name,label}}",
+            "html_url": f"https://github.com/{repo}/releases/tag/{tag}",
+            "id": rid,
+            "author": author,
+            "node_id": f"RE_kwDOAbCdEf{rid}",
+            "tag_name": tag,
+            "target_commitish": "main",
+            "name": f"Release {tag}",
+            "draft": False,
+            "prerelease": rng.random() < 0.15,
+            "created_at": "2026-01-01T00:00:00Z",
+            "published_at": "2026-01-01T00:00:00Z",
+            "assets": assets,
+            "tarball_url": f"https://api.github.com/repos/{repo}/tarball/{tag}",
+            "zipball_url": f"https://api.github.com/repos/{repo}/zipball/{tag}",
+            "body": "## Changes\n" + "\n".join(f"- Fixed issue #{rng.randrange(9999)}" for _ in range(rng.randint(3, 25))),
+            "reactions": {"total_count": rng.randrange(100), "+1": rng.randrange(50), "heart": rng.randrange(20)},
+        })
+    return payload
+
+
+def gitlab_releases(rng, releases=20):
+    """A GitLab /projects/:id/releases style payload."""
+    author = {
+        "id": rng.randrange(10 ** 6),
+        "username": f"dev{rng.randrange(1000)}",
+        "name": "Synthetic Dev",
+        "state": "active",
+        "avatar_url": "https://gitlab.com/uploads/-/system/user/avatar/1/avatar.png",
+        "web_url": "https://gitlab.com/dev",
+    }
+    payload = []
+    for n in range(releases):
+        tag = f"v{releases - n}.{rng.randrange(20)}.{rng.randrange(100)}"
+        payload.append({
+            "name": f"Release {tag}",
+            "tag_name": tag,
+            "description": "Changelog\n" + "\n".join(f"* item {i}" for i in range(rng.randint(2, 15))),
+            "created_at": "2026-01-01T00:00:00.000Z",
+            "released_at": "2026-01-01T00:00:00.000Z",
+            "upcoming_release": False,
+            "author": author,
+            "commit": {"id": hashlib.sha1(tag.encode()).hexdigest(), "title": "Bump version", "author_name": "dev"},
+            "assets": {
+                "count": 4,
+                "sources": [
+                    {"format": fmt, "url": f"https://gitlab.com/group/project/-/archive/{tag}/project-{tag}.{fmt}"}
+                    for fmt in ("zip", "tar.gz", "tar.bz2", "tar")
+                ],
+                "links": [
+                    {
+                        "id": rng.randrange(10 ** 6),
+                        "name": f"app-{tag}-{i}.apk",
+                        "url": f"https://gitlab.com/group/project/-/releases/{tag}/downloads/app-{i}.apk",
+                        "link_type": "package",
+                    }
+                    for i in range(rng.randint(1, 4))
+                ],
+            },
+            "_links": {"self": f"https://gitlab.com/group/project/-/releases/{tag}"},
+        })
+    return payload
+
+
+class PayloadPool:
+    """Pre-encoded payload variants; each repo maps to one by a stable hash."""
+
+    def __init__(self, variants=PAYLOAD_VARIANTS, seed=7):
+        rng = random.Random(seed)
+        self.github = [json.dumps(github_releases(rng, rng.randint(1, 20))).encode() for _ in range(variants)]
+        self.gitlab = [json.dumps(gitlab_releases(rng, rng.randint(1, 20))).encode() for _ in range(variants)]
+
+    def lookup(self, kind, repo):
+        """Return (status, body) for a repo; a stable slice of repos is missing or empty."""
+        digest = int(hashlib.md5(repo.lower().encode()).hexdigest(), 16)
+        bucket = (digest % 10000) / 10000
+        if bucket < MISSING_REPO_RATIO:
+            return 404, b'{"message":"Not Found"}'
+        if bucket < MISSING_REPO_RATIO + EMPTY_RELEASES_RATIO:
+            return 200, b"[]"
+        pool = self.github if kind == "github" else self.gitlab
+        return 200, pool[digest % len(pool)]
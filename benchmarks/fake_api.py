@@ -0,0 +1,56 @@
+"""
+Local stand-in for the GitHub and GitLab release APIs.
+
+    GET /repos/<owner>/<repo>/releases            (GitHub shape)
+    GET /api/v4/projects/<url-encoded path>/releases  (GitLab shape)
+
+Responses come from a PayloadPool, so serving is just a dict lookup and a
+socket write; the server costs the benchmarked process next to nothing.
+"""
+import threading
+import urllib.parse
+
+from benchmarks.catalog import PayloadPool
+from benchmarks.local_server import LocalHandler, LocalServer
+
+
+class _Handler(LocalHandler):
+    def do_GET(self):
+        owner = self.server.owner
+        path = urllib.parse.urlsplit(self.path).path
+        parts = path.strip("/").split("/")
+
+        if len(parts) == 4 and parts[0] == "repos" and parts[3] == "releases":
+            status, body = owner.pool.lookup("github", f"{parts[1]}/{parts[2]}")
+        elif len(parts) == 5 and parts[:3] == ["api", "v4", "projects"] and parts[4] == "releases":
+            status, body = owner.pool.lookup("gitlab", urllib.parse.unquote(parts[3]))
+        else:
+            status, body = 404, b'{"message":"Not Found"}'
+
+        with owner.lock:
+            owner.requests += 1
+            owner.bytes_sent += len(body)
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class FakeReleaseAPI(LocalServer):
+    """Threaded fake API server; use as a context manager."""
+
+    handler = _Handler
+
+    def __init__(self, pool=None, host="127.0.0.1", port=0):
+        super().__init__(host=host, port=port)
+        self.pool = pool or PayloadPool()
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.bytes_sent = 0
+
+    @property
+    def stats(self):
+        with self.lock:
+            return {"requests": self.requests, "bytes_sent": self.bytes_sent}
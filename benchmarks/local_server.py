@@ -0,0 +1,47 @@
+"""
+Threaded local HTTP server shared by the fake APIs (benchmarks and tests).
+Subclasses (or callers) only supply the request handler.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class LocalHandler(BaseHTTPRequestHandler):
+    """Keep-alive, no Nagle delay, no access log. `self.server.owner` is the LocalServer."""
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServer:
+    """ThreadingHTTPServer on a free port, served from a daemon thread; use as a context manager."""
+
+    handler = LocalHandler
+
+    def __init__(self, handler=None, host="127.0.0.1", port=0):
+        self._server = ThreadingHTTPServer((host, port), handler or self.handler)
+        self._server.daemon_threads = True
+        self._server.owner = self
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
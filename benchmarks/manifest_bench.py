@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Manifest benchmark: msgpack updates.bin vs packed updates.idx.
+
+Measures how long a client needs before it can answer a lookup (load time)
+and how long each lookup takes afterwards, for a synthetic catalog.
+
+    python benchmarks/manifest_bench.py --entries 90000 --lookups 20000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import msgpack
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".github", "scripts"))
+from packed_manifest import PackedManifest, write_manifest  # noqa: E402
+
+
+def synthetic_manifest(entries, seed=42):
+    rng = random.Random(seed)
+    manifest = {}
+    for i in range(entries):
+        app_id = f"com.vendor{rng.randrange(5000)}.app{i}"
+        manifest[app_id] = f"v{rng.randrange(30)}.{rng.randrange(100)}.{rng.randrange(1000)}"
+    return manifest
+
+
+def _best_of(fn, repeat):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(entries, lookups, repeat):
+    manifest = synthetic_manifest(entries)
+    keys = list(manifest)
+    rng = random.Random(7)
+    probe = [rng.choice(keys) for _ in range(lookups)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        bin_path = os.path.join(tmp, "updates.bin")
+        idx_path = os.path.join(tmp, "updates.idx")
+        with open(bin_path, "wb") as f:
+            f.write(msgpack.packb(manifest))
+        write_manifest(manifest, idx_path)
+
+        def load_msgpack():
+            with open(bin_path, "rb") as f:
+                return msgpack.unpackb(f.read())
+
+        def load_packed():
+            return PackedManifest(idx_path)
+
+        msgpack_load, decoded = _best_of(load_msgpack, repeat)
+        packed_load, packed = _best_of(load_packed, repeat)
+
+        msgpack_lookup, _ = _best_of(lambda: [decoded[k] for k in probe], repeat)
+        packed_lookup, _ = _best_of(lambda: [packed[k] for k in probe], repeat)
+
+        # Cold path: open + single lookup, what a one-shot client actually pays
+        msgpack_cold, _ = _best_of(lambda: load_msgpack()[probe[0]], repeat)
+
+        def packed_one_shot():
+            with PackedManifest(idx_path) as m:
+                return m[probe[0]]
+
+        packed_cold, _ = _best_of(packed_one_shot, repeat)
+        packed.close()
+
+        return {
+            "entries": entries,
+            "lookups": lookups,
+            "msgpack": {
+                "size_bytes": os.path.getsize(bin_path),
+                "load_ms": msgpack_load * 1000,
+                "lookup_us": msgpack_lookup / lookups * 1e6,
+                "open_and_lookup_ms": msgpack_cold * 1000,
+            },
+            "packed": {
+                "size_bytes": os.path.getsize(idx_path),
+                "load_ms": packed_load * 1000,
+                "lookup_us": packed_lookup / lookups * 1e6,
+                "open_and_lookup_ms": packed_cold * 1000,
+            },
+        }
+
+
+def print_report(result):
+    print(f"📊 Manifest benchmark ({result['entries']} entries, {result['lookups']} lookups)")
+    print(f"{'format':<10}{'size (KB)':>12}{'load (ms)':>12}{'lookup (us)':>14}{'open+1 (ms)':>14}")
+    for name in ("msgpack", "packed"):
+        r = result[name]
+        print(
+            f"{name:<10}{r['size_bytes'] / 1024:>12.1f}{r['load_ms']:>12.3f}"
+            f"{r['lookup_us']:>14.3f}{r['open_and_lookup_ms']:>14.3f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark updates.bin vs updates.idx")
+    parser.add_argument("--entries", type=int, default=90000, help="Number of manifest entries")
+    parser.add_argument("--lookups", type=int, default=20000, help="Number of random lookups")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions (best run is reported)")
+    args = parser.parse_args()
+    print_report(run(args.entries, args.lookups, args.repeat))
+
+
+if __name__ == "__main__":
+    main()
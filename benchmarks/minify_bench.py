@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Releases decode benchmark: r.json() + minify_release vs decode_releases().
+
+Bodies are 20-release GitHub and GitLab responses from benchmarks.catalog
+(full payload shape: author/uploader objects, node_ids, changelogs, many
+assets). Reports time per response and peak Python allocations while
+decoding one response.
+
+    python -m benchmarks.minify_bench --responses 200
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from benchmarks.catalog import github_releases, gitlab_releases
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".github", "scripts"))
+import mirror_generator  # noqa: E402
+from mirror_generator import minify_release  # noqa: E402
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+_SCALARS = ("string", "number", "boolean", "null")
+_RELEASE_KEYS = {"tag_name", "name", "prerelease", "published_at", "released_at", "created_at", "html_url"}
+_ASSET_KEYS = {"name", "size", "browser_download_url", "content_type", "download_count"}
+_LINK_KEYS = {"name", "url", "link_type"}
+
+
+def recorded_responses(count, seed=3):
+    rng = random.Random(seed)
+    bodies = []
+    for i in range(count):
+        payload = github_releases(rng, 20) if i % 4 else gitlab_releases(rng, 20)
+        bodies.append(json.dumps(payload).encode())
+    return bodies
+
+
+def baseline(raw):
+    """What generate_mirror did before: requests' r.json() then minify each release."""
+    data = json.loads(raw.decode("utf-8"))
+    return [minify_release(r) for r in data]
+
+
+def decode_stdlib(raw):
+    orjson, mirror_generator.orjson = mirror_generator.orjson, None
+    try:
+        return mirror_generator.decode_releases(raw)
+    finally:
+        mirror_generator.orjson = orjson
+
+
+def decode_streaming(raw):
+    """
+    ijson event stream keeping only the fields minify_release reads, so the
+    full payload is never materialised. Kept here as the measured alternative.
+    """
+    releases = []
+    release = item = None
+    for prefix, event, value in ijson.parse(raw):
+        if event not in _SCALARS:
+            if event == "start_map":
+                if prefix == "item":
+                    release = {"_links": {}}
+                    releases.append(release)
+                elif prefix == "item.assets":          # GitLab: {"links": [...]}
+                    release["assets"] = {"links": []}
+                elif prefix == "item.assets.item":     # GitHub asset
+                    item = {}
+                    release["assets"].append(item)
+                elif prefix == "item.assets.links.item":
+                    item = {}
+                    release["assets"]["links"].append(item)
+            elif event == "start_array" and prefix == "item.assets":
+                release["assets"] = []                 # GitHub: [...]
+            continue
+        key = prefix[5:]
+        if key in _RELEASE_KEYS:
+            release[key] = value
+        elif key == "_links.self":
+            release["_links"]["self"] = value
+        elif key.startswith("assets.item.") and key[12:] in _ASSET_KEYS:
+            item[key[12:]] = value
+        elif key.startswith("assets.links.item.") and key[18:] in _LINK_KEYS:
+            item[key[18:]] = value
+    return [minify_release(r) for r in releases]
+
+
+def _time_per_response(fn, bodies, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for raw in bodies:
+            fn(raw)
+        best = min(best, time.perf_counter() - start)
+    return best / len(bodies)
+
+
+def _peak_alloc(fn, raw):
+    tracemalloc.start()
+    fn(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark releases decode + minify paths")
+    parser.add_argument("--responses", type=int, default=200, help="Number of 20-release responses")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions (best run is reported)")
+    args = parser.parse_args()
+
+    bodies = recorded_responses(args.responses)
+    expected = [baseline(raw) for raw in bodies]
+
+    candidates = [("r.json() + minify", baseline), ("decode_releases (json)", decode_stdlib)]
+    if mirror_generator.orjson:
+        candidates.append(("decode_releases (orjson)", mirror_generator.decode_releases))
+    if ijson:
+        candidates.append((f"ijson stream ({ijson.backend})", decode_streaming))
+
+    avg = sum(map(len, bodies)) / len(bodies)
+    print(f"📊 Decode benchmark ({len(bodies)} responses, avg {avg / 1024:.1f} KB)")
+    print(f"{'path':<30}{'ms/response':>14}{'peak alloc (KB)':>18}{'matches':>10}")
+    for label, fn in candidates:
+        matches = all(fn(raw) == exp for raw, exp in zip(bodies, expected))
+        per = _time_per_response(fn, bodies, args.repeat)
+        peak = max(_peak_alloc(fn, raw) for raw in bodies[:20])
+        print(f"{label:<30}{per * 1000:>14.3f}{peak / 1024:>18.1f}{'yes' if matches else 'NO':>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the mirror data pipeline.
+
+For each catalog size a synthetic apps.json is generated, a fake
+GitHub/GitLab release API is started locally and generate_mirror() runs in
+a fresh subprocess (so peak RSS belongs to that run alone). Reported per
+size: wall time, peak RSS, files/bytes written, and per-stage timings and
+counters from the metrics layer.
+
+    python -m benchmarks.pipeline --sizes 1000 10000 90000
+    python -m benchmarks.pipeline --sizes 10000 --partitions 4
+    python -m benchmarks.pipeline --compare benchmarks/results/pipeline-<old>.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.catalog import build_catalog
+from benchmarks.fake_api import FakeReleaseAPI
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = (1000, 10000)
+OUTPUTS = ("mirror.json", "updates.bin", "updates.idx")
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+def _peak_rss_mb():
+    # Partitioned runs fork a pool: the largest single process is what matters
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _output_stats(workdir):
+    stats = {}
+    for name in OUTPUTS:
+        path = os.path.join(workdir, name)
+        stats[name] = {"files": 1, "bytes": os.path.getsize(path)} if os.path.exists(path) else {"files": 0, "bytes": 0}
+
+    files = size = 0
+    for dirpath, _, filenames in os.walk(os.path.join(workdir, "mirrors")):
+        for filename in filenames:
+            files += 1
+            size += os.path.getsize(os.path.join(dirpath, filename))
+    stats["mirrors/"] = {"files": files, "bytes": size}
+    return stats
+
+
+def worker(workdir, github_api, gitlab_api, result_path, partitions=1):
+    """Runs inside the subprocess: one generate_mirror() (or partitioned) run, measured."""
+    os.environ["ORION_METRICS"] = "1"
+    sys.path.insert(0, os.path.join(ROOT, ".github", "scripts"))
+    os.chdir(workdir)
+
+    import mirror_generator
+    import partitioned_mirror
+    from metrics import metrics
+
+    with open("generator.log", "w", encoding="utf-8") as log, contextlib.redirect_stdout(log):
+        start = time.perf_counter()
+        if partitions > 1:
+            # Stage metrics below then only cover the merge; partitions report in their own processes
+            partitioned_mirror.run_local(partitions, github_api_url=github_api, gitlab_api_url=gitlab_api)
+        else:
+            mirror_generator.generate_mirror(github_api_url=github_api, gitlab_api_url=gitlab_api)
+        wall = time.perf_counter() - start
+
+    outputs = _output_stats(workdir)
+    report = metrics.snapshot("benchmark")
+    with open(result_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "wall_s": round(wall, 4),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "files_written": sum(o["files"] for o in outputs.values()),
+            "bytes_written": sum(o["bytes"] for o in outputs.values()),
+            "outputs": outputs,
+            "stages": report["timers"],
+            "counters": report["counters"],
+        }, f)
+
+
+def run_size(size, seed=1, partitions=1):
+    workdir = tempfile.mkdtemp(prefix=f"orion-bench-{size}-")
+    try:
+        apps = build_catalog(size, seed=seed)
+        with open(os.path.join(workdir, "apps.json"), "w", encoding="utf-8") as f:
+            json.dump(apps, f)
+
+        result_path = os.path.join(workdir, "result.json")
+        with FakeReleaseAPI() as api:
+            subprocess.run(
+                [sys.executable, "-m", "benchmarks.pipeline", "--worker",
+                 "--workdir", workdir, "--api", api.url, "--result", result_path,
+                 "--partitions", str(partitions)],
+                cwd=ROOT, check=True,
+            )
+            api_stats = api.stats
+
+        with open(result_path, "r", encoding="utf-8") as f:
+            result = json.load(f)
+        result.update({"apps": size, "seed": seed, "partitions": partitions, "api": api_stats})
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_run(result):
+    print(
+        f"📦 {result['apps']:>6} apps x{result['partitions']} | {result['wall_s']:>8.2f}s | peak RSS {result['peak_rss_mb']:>7.1f} MB | "
+        f"{result['files_written']:>6} files, {result['bytes_written'] / 1024 / 1024:>7.1f} MB written | "
+        f"{result['api']['requests']} API calls"
+    )
+    for stage in result["stages"]:
+        if stage["stage"] in ("dns", "http"):
+            continue
+        label = f"{stage['stage']} ({stage['host']})" if stage["host"] else stage["stage"]
+        print(f"     {label:<32}{stage['count']:>8} calls {stage['total_s']:>10.3f}s")
+
+
+def compare(previous, current):
+    """Print wall time / RSS deltas against an earlier results file."""
+    before = {(r["apps"], r.get("partitions", 1)): r for r in previous["runs"]}
+    print(f"\n📈 Compared with {previous.get('commit', '?')}:")
+    for run in current["runs"]:
+        old = before.get((run["apps"], run["partitions"]))
+        if not old:
+            print(f"   {run['apps']:>6} apps: no baseline")
+            continue
+        wall = (run["wall_s"] - old["wall_s"]) / old["wall_s"] * 100 if old["wall_s"] else 0.0
+        rss = (run["peak_rss_mb"] - old["peak_rss_mb"]) / old["peak_rss_mb"] * 100 if old["peak_rss_mb"] else 0.0
+        print(f"   {run['apps']:>6} apps: wall {wall:+6.1f}%  peak RSS {rss:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark generate_mirror against a synthetic catalog")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Catalog sizes to run")
+    parser.add_argument("--seed", type=int, default=1, help="Catalog seed")
+    parser.add_argument("--partitions", type=int, default=1, help="Run partitioned (local process pool) with N partitions")
+    parser.add_argument("--output", help="Results JSON (default: benchmarks/results/pipeline-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier results JSON to diff against")
+    # Internal: subprocess entry point
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", help=argparse.SUPPRESS)
+    parser.add_argument("--api", help=argparse.SUPPRESS)
+    parser.add_argument("--result", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.workdir, args.api, args.api, args.result, args.partitions)
+        return
+
+    commit = _git_commit()
+    results = {
+        "commit": commit,
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": [],
+    }
+    print(f"🏁 Pipeline benchmark @ {commit}")
+    for size in args.sizes:
+        result = run_size(size, args.seed, args.partitions)
+        results["runs"].append(result)
+        print_run(result)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+    print(f"📝 Results saved to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
 from utils import setup_session, load_config, save_config
-import requests
+from metrics import metrics
+from releases import ReleasesClient, GITHUB_API_URL
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import os
-from github import Github
-import re
+import urllib.parse
+
+UPLOAD_WORKERS = 4
 
 class APKDownloader:
-    def __init__(self, github_token=None):
+    def __init__(self, github_token=None, api_url=GITHUB_API_URL):
         self.session = setup_session()
-        self.gh = Github(github_token) if github_token else None
+        self.github_token = github_token
+        self.api_url = api_url
     
     def download_apk(self, url, filename):
         """Download APK file with proper handling"""
@@ -23,21 +27,24 @@ class APKDownloader:
             
             filepath = os.path.join('downloads', filename)
             
-            # Stream download to handle large files
-            response = self.session.get(url, stream=True, timeout=60)
-            response.raise_for_status()
-            
-            # Check if it's actually an APK file
-            content_type = response.headers.get('content-type', '').lower()
-            content_length = response.headers.get('content-length', 0)
-            
-            print(f"📊 Response - Type: {content_type}, Size: {content_length} bytes")
-            
-            # Write file in chunks
-            with open(filepath, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            host = urllib.parse.urlsplit(url).hostname
+            with metrics.timer("download", host=host):
+                # Stream download to handle large files
+                response = self.session.get(url, stream=True, timeout=60)
+                response.raise_for_status()
+                
+                # Check if it's actually an APK file
+                content_type = response.headers.get('content-type', '').lower()
+                content_length = response.headers.get('content-length', 0)
+                
+                print(f"📊 Response - Type: {content_type}, Size: {content_length} bytes")
+                
+                # Write file in chunks
+                with open(filepath, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        if chunk:
+                            f.write(chunk)
+                            metrics.incr("bytes_received", len(chunk), host=host)
             
             # Verify the downloaded file
             file_size = os.path.getsize(filepath)
@@ -59,67 +66,108 @@ class APKDownloader:
     
     def upload_to_release(self, repo_name, filepath, release_tag, version):
         """Upload APK to GitHub release with proper error handling"""
-        if not self.gh:
+        return self.upload_batch(repo_name, [(release_tag, filepath, version)]).get(filepath, False)
+    
+    def upload_batch(self, repo_name, items, max_workers=UPLOAD_WORKERS, prune=True):
+        """
+        Upload many APKs to GitHub releases in one go.
+        
+        items: iterable of (release_tag, filepath, version)
+        Releases are resolved/created once per tag, then files are streamed
+        concurrently (bounded by max_workers) over one pooled session. Each file
+        replaces any asset with the same name atomically (temp upload -> delete
+        old -> rename). With prune=True, older assets of a tag are removed once
+        every upload for that tag succeeded.
+        
+        Returns {filepath: bool}.
+        """
+        items = list(items)
+        results = {filepath: False for _, filepath, _ in items}
+        if not self.github_token:
             print("❌ GitHub token not provided - cannot upload to releases")
-            return False
+            return results
         
-        try:
-            repo = self.gh.get_repo(repo_name)
-            print(f"📦 Preparing to upload to repository: {repo_name}")
-            
-            # Check if file exists and has reasonable size
+        # Validate files up front (same checks as the single-file path always did)
+        valid = []
+        for release_tag, filepath, version in items:
             if not os.path.exists(filepath):
                 print(f"❌ File not found: {filepath}")
-                return False
-            
+                continue
             file_size = os.path.getsize(filepath)
             if file_size < 1024:  # Less than 1KB
                 print(f"❌ File too small: {file_size} bytes - likely not a valid APK")
-                return False
-            
+                continue
             print(f"📁 File to upload: {filepath} ({file_size} bytes)")
-            
-            # Check if release exists
+            valid.append((release_tag, filepath, version))
+        
+        if not valid:
+            return results
+        
+        client = ReleasesClient(self.github_token, repo_name, api_url=self.api_url, concurrency=max_workers)
+        print(f"📦 Preparing {len(valid)} upload(s) to repository: {repo_name}")
+        
+        # 1. Resolve (or create) each release once
+        releases = {}
+        for release_tag, filepath, version in valid:
+            if release_tag in releases:
+                continue
             try:
-                release = repo.get_release(release_tag)
-                print(f"🔄 Release '{release_tag}' exists, updating...")
-                
-                # Delete existing assets
-                assets = release.get_assets()
-                asset_count = 0
-                for asset in assets:
-                    print(f"🗑️  Deleting old asset: {asset.name}")
-                    asset.delete_asset()
-                    asset_count += 1
-                print(f"✅ Deleted {asset_count} old assets")
-                
+                release = client.get_release(release_tag)
+                if release:
+                    print(f"🔄 Release '{release_tag}' exists, updating...")
+                else:
+                    print(f"📝 Release '{release_tag}' doesn't exist, creating new release...")
+                    release = client.create_release(
+                        release_tag,
+                        name=f"{os.path.basename(filepath).replace('.apk', '')} {version}",
+                        body=f"Auto-updated APK - Version {version}\n\nDownloaded from GetModsApk",
+                    )
+                    print(f"✅ Created new release: {release_tag}")
+                releases[release_tag] = release
             except Exception as e:
-                print(f"📝 Release '{release_tag}' doesn't exist, creating new release...")
-                # Create new release
-                release = repo.create_git_release(
-                    tag=release_tag,
-                    name=f"{os.path.basename(filepath).replace('.apk', '')} {version}",
-                    message=f"Auto-updated APK - Version {version}\n\nDownloaded from GetModsApk",
-                    draft=False,
-                    prerelease=False
-                )
-                print(f"✅ Created new release: {release_tag}")
-            
-            # Upload APK file
-            print(f"⬆️  Uploading {os.path.basename(filepath)} to release...")
-            with open(filepath, 'rb') as f:
-                release.upload_asset(
-                    path=filepath,
-                    label=os.path.basename(filepath),
-                    content_type='application/vnd.android.package-archive'
-                )
-            
-            print(f"✅ Successfully uploaded {filepath} to release {release_tag}")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error uploading to release: {e}")
-            return False
+                print(f"❌ Error preparing release '{release_tag}': {e}")
+        
+        # 2. Stream uploads concurrently
+        def upload(release_tag, filepath):
+            release = releases[release_tag]
+            name = os.path.basename(filepath)
+            print(f"⬆️  Uploading {name} to release {release_tag}...")
+            client.replace_asset(release, filepath, name, release.get("assets", []))
+            return name
+        
+        uploaded = {}  # release_tag -> set of asset names now in place
+        failed_tags = set()
+        with ThreadPoolExecutor(max_workers=max(max_workers, 1)) as executor:
+            futures = {
+                executor.submit(upload, release_tag, filepath): (release_tag, filepath)
+                for release_tag, filepath, _ in valid
+                if release_tag in releases
+            }
+            for future in as_completed(futures):
+                release_tag, filepath = futures[future]
+                try:
+                    uploaded.setdefault(release_tag, set()).add(future.result())
+                    results[filepath] = True
+                    print(f"✅ Successfully uploaded {filepath} to release {release_tag}")
+                except Exception as e:
+                    failed_tags.add(release_tag)
+                    print(f"❌ Error uploading {filepath} to release: {e}")
+        
+        # 3. Prune superseded assets, only where the whole tag went through
+        if prune:
+            for release_tag, names in uploaded.items():
+                if release_tag in failed_tags:
+                    print(f"⚠️  Keeping old assets on '{release_tag}' (some uploads failed)")
+                    continue
+                stale = [a for a in releases[release_tag].get("assets", []) if a["name"] not in names]
+                for asset in stale:
+                    try:
+                        print(f"🗑️  Deleting old asset: {asset['name']}")
+                        client.delete_asset(asset["id"])
+                    except Exception as e:
+                        print(f"⚠️  Could not delete {asset['name']}: {e}")
+        
+        return results
     
     def update_apk_list(self, apk_name, new_version):
         """Update APK list with new version"""
@@ -2,19 +2,16 @@
 import argparse
 from scraper import GetModsApkScraper
 from downloader import APKDownloader
-from utils import load_config, save_config
+from utils import load_config, save_config, normalize_version
+from metrics import metrics
+import json
 import os
-import re
 
-def normalize_version(version):
-    """Normalize version string for comparison"""
-    if not version:
-        return ""
-    # Remove 'v' prefix and any non-version characters
-    version = re.sub(r'^v', '', str(version).strip())
-    # Keep only version numbers and dots
-    version = re.sub(r'[^\d.]', '', version)
-    return version
+def load_change_set(path):
+    """Load the change set written by update_checker.py, keyed by APK name"""
+    with open(path, 'r', encoding='utf-8') as f:
+        change_set = json.load(f)
+    return {change['name']: change for change in change_set.get('changes', [])}
 
 def main():
     parser = argparse.ArgumentParser(description='APK Scraper for GetModsApk')
@@ -24,6 +21,7 @@ def main():
     parser.add_argument('--tag', help='Release tag for manual download')
     parser.add_argument('--name', help='APK name for manual download')
     parser.add_argument('--force', action='store_true', help='Force download even if version matches')
+    parser.add_argument('--changes', help='Change set from update_checker.py - only process the APKs it lists')
     
     args = parser.parse_args()
     
@@ -40,14 +38,32 @@ def main():
         print("🚀 Running auto scraper...")
         config = load_config()
         downloaded_count = 0
+        pending_uploads = []
+        tracked_apks = config['tracked_apks']
         
-        for apk in config['tracked_apks']:
+        # With a change set the checker already probed every page: skip unchanged APKs
+        # and reuse the version it saw instead of fetching each page again
+        changes = None
+        if args.changes:
+            changes = load_change_set(args.changes)
+            for apk in tracked_apks:
+                if apk['name'] not in changes:
+                    metrics.incr("apks_skipped", apk=apk['name'], reason="unchanged")
+            tracked_apks = [apk for apk in tracked_apks if apk['name'] in changes]
+            print(f"📋 Change set lists {len(changes)} APK(s), {len(tracked_apks)} tracked")
+        
+        for apk in tracked_apks:
             print(f"\n" + "="*50)
             print(f"🔍 Processing {apk['name']}...")
             print(f"🌐 URL: {apk['base_url']}")
             
             # Check current version
-            current_version = scraper.get_current_version(apk['base_url'])
+            if changes is not None:
+                current_version = changes[apk['name']]['new_version']
+                metrics.incr("version_cache_hits")
+            else:
+                with metrics.timer("version_check"):
+                    current_version = scraper.get_current_version(apk['base_url'])
             if not current_version:
                 print(f"❌ Could not determine current version for {apk['name']}")
                 continue
@@ -68,7 +84,8 @@ def main():
                     print(f"🆕 New version found: {current_version} (was {apk['current_version']})")
                 
                 # Get download link
-                download_url = scraper.get_download_links(apk['base_url'])
+                with metrics.timer("resolve_download"):
+                    download_url = scraper.get_download_links(apk['base_url'])
                 if download_url:
                     print(f"🔗 Download URL obtained: {download_url}")
                     filename = f"{apk['name'].replace(' ', '-').lower()}-{current_version}.apk"
@@ -80,18 +97,8 @@ def main():
                         downloaded_count += 1
                         
                         if github_token:
-                            print(f"📤 Attempting to upload to GitHub releases...")
-                            success = downloader.upload_to_release(
-                                repo_name, 
-                                filepath, 
-                                apk['release_tag'], 
-                                current_version
-                            )
-                            if success:
-                                downloader.update_apk_list(apk['name'], current_version)
-                                print(f"🎉 Successfully completed for {apk['name']}")
-                            else:
-                                print(f"❌ Failed to upload to release for {apk['name']}")
+                            # Uploaded together with the rest of the batch below
+                            pending_uploads.append((apk, filepath, current_version))
                         else:
                             print(f"⚠️  No GitHub token - skipping release upload")
                     else:
@@ -101,6 +108,20 @@ def main():
             else:
                 print(f"✅ No update available for {apk['name']}")
         
+        if pending_uploads:
+            print(f"\n" + "="*50)
+            print(f"📤 Uploading {len(pending_uploads)} APK(s) to GitHub releases...")
+            results = downloader.upload_batch(
+                repo_name,
+                [(apk['release_tag'], filepath, version) for apk, filepath, version in pending_uploads]
+            )
+            for apk, filepath, version in pending_uploads:
+                if results.get(filepath):
+                    downloader.update_apk_list(apk['name'], version)
+                    print(f"🎉 Successfully completed for {apk['name']}")
+                else:
+                    print(f"❌ Failed to upload to release for {apk['name']}")
+        
         print(f"\n" + "="*50)
         print(f"📊 Summary: Downloaded {downloaded_count} new APK(s)")
         
@@ -125,6 +146,9 @@ def main():
     
     else:
         parser.print_help()
+        return
+    
+    metrics.finish("main")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,253 @@
+import json
+import os
+import socket
+import threading
+import time
+import urllib.parse
+
+# Env switches (metrics are OFF unless one of these is set)
+ENV_ENABLE = "ORION_METRICS"              # "1" -> collect + print summary table
+ENV_JSON_REPORT = "ORION_METRICS_JSON"    # path for the JSON run report
+ENV_PROM_REPORT = "ORION_METRICS_PROM"    # path for Prometheus text format
+
+PROM_PREFIX = "orion"
+
+
+class _NullTimer:
+    """Shared no-op timer handed out while metrics are disabled."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ("_metrics", "_key", "_start")
+
+    def __init__(self, metrics, key):
+        self._metrics = metrics
+        self._key = key
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._metrics._observe(self._key, time.perf_counter() - self._start)
+        return False
+
+
+class Metrics:
+    """
+    Per-stage / per-host timers and counters for a single script run.
+    When disabled every call returns immediately, so call sites never need
+    their own `if metrics.enabled` guards.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._timers = {}    # (stage, host) -> [count, total, min, max]
+        self._counters = {}  # (name, ((label, value), ...)) -> value
+        self._started = time.time()
+        self._dns_patched = False
+
+    # --- Recording ---
+    def timer(self, stage, host=None):
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, (stage, host))
+
+    def observe(self, stage, seconds, host=None):
+        if self.enabled:
+            self._observe((stage, host), seconds)
+
+    def incr(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def _observe(self, key, seconds):
+        with self._lock:
+            stat = self._timers.get(key)
+            if stat is None:
+                self._timers[key] = [1, seconds, seconds, seconds]
+            else:
+                stat[0] += 1
+                stat[1] += seconds
+                if seconds < stat[2]:
+                    stat[2] = seconds
+                if seconds > stat[3]:
+                    stat[3] = seconds
+
+    # --- Integrations ---
+    def instrument_session(self, session):
+        """Attach a response hook recording per-host HTTP time, status and bytes."""
+        if self.enabled:
+            session.hooks.setdefault("response", []).append(self._response_hook)
+        return session
+
+    def record_http(self, host, seconds, status, size=None):
+        """One finished HTTP exchange; shared by the requests hook and Http2Session."""
+        if not self.enabled:
+            return
+        host = host or "unknown"
+        self.observe("http", seconds, host=host)
+        self.incr("http_requests", host=host, status=str(status))
+        if size is not None:
+            self.incr("bytes_received", size, host=host)
+
+    def _response_hook(self, response, *args, **kwargs):
+        host = urllib.parse.urlsplit(response.url).hostname
+        # Body is read right after the hooks anyway, so this costs nothing extra
+        size = None if kwargs.get("stream") else len(response.content or b"")
+        self.record_http(host, response.elapsed.total_seconds(), response.status_code, size)
+        return response
+
+    def _patch_dns(self):
+        """Time name resolution per host by wrapping socket.getaddrinfo (enabled runs only)."""
+        if self._dns_patched:
+            return
+        original = socket.getaddrinfo
+        metrics = self
+
+        def timed_getaddrinfo(host, *args, **kwargs):
+            with metrics.timer("dns", host=host if isinstance(host, str) else None):
+                return original(host, *args, **kwargs)
+
+        socket.getaddrinfo = timed_getaddrinfo
+        self._dns_patched = True
+
+    # --- Reporting ---
+    def snapshot(self, script=None):
+        with self._lock:
+            timers = [
+                {
+                    "stage": stage,
+                    "host": host,
+                    "count": count,
+                    "total_s": round(total, 6),
+                    "min_s": round(low, 6),
+                    "max_s": round(high, 6),
+                }
+                for (stage, host), (count, total, low, high) in sorted(
+                    self._timers.items(), key=lambda kv: (kv[0][0], kv[0][1] or "")
+                )
+            ]
+            counters = [
+                {"name": name, "labels": dict(labels), "value": value}
+                for (name, labels), value in sorted(self._counters.items())
+            ]
+        return {
+            "script": script,
+            "started_at": self._started,
+            "duration_s": round(time.time() - self._started, 6),
+            "timers": timers,
+            "counters": counters,
+        }
+
+    def to_prometheus(self, script=None):
+        report = self.snapshot(script)
+        lines = []
+
+        def labels(**values):
+            pairs = [(k, v) for k, v in values.items() if v is not None]
+            if script:
+                pairs.insert(0, ("script", script))
+            if not pairs:
+                return ""
+            rendered = []
+            for k, v in pairs:
+                v = str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+                rendered.append(f'{k}="{v}"')
+            return "{" + ",".join(rendered) + "}"
+
+        lines.append(f"# TYPE {PROM_PREFIX}_stage_seconds_total counter")
+        for t in report["timers"]:
+            lines.append(f"{PROM_PREFIX}_stage_seconds_total{labels(stage=t['stage'], host=t['host'])} {t['total_s']}")
+        lines.append(f"# TYPE {PROM_PREFIX}_stage_calls_total counter")
+        for t in report["timers"]:
+            lines.append(f"{PROM_PREFIX}_stage_calls_total{labels(stage=t['stage'], host=t['host'])} {t['count']}")
+
+        seen = set()
+        for c in report["counters"]:
+            metric = f"{PROM_PREFIX}_{c['name']}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            lines.append(f"{metric}{labels(**c['labels'])} {c['value']}")
+
+        lines.append(f"# TYPE {PROM_PREFIX}_run_duration_seconds gauge")
+        lines.append(f"{PROM_PREFIX}_run_duration_seconds{labels()} {report['duration_s']}")
+        return "\n".join(lines) + "\n"
+
+    def summary_table(self, script=None):
+        report = self.snapshot(script)
+        rows = [("stage", "host", "calls", "total (s)", "avg (ms)", "max (ms)")]
+        for t in report["timers"]:
+            rows.append((
+                t["stage"],
+                t["host"] or "-",
+                str(t["count"]),
+                f"{t['total_s']:.3f}",
+                f"{t['total_s'] / t['count'] * 1000:.1f}",
+                f"{t['max_s'] * 1000:.1f}",
+            ))
+        widths = [max(len(r[i]) for r in rows) for i in range(len(rows[0]))]
+        out = [f"⏱️  Run metrics{f' ({script})' if script else ''}: {report['duration_s']:.2f}s total"]
+        for i, row in enumerate(rows):
+            out.append("  ".join(cell.ljust(widths[j]) for j, cell in enumerate(row)).rstrip())
+            if i == 0:
+                out.append("  ".join("-" * w for w in widths))
+
+        if report["counters"]:
+            out.append("")
+            for c in report["counters"]:
+                label_text = ",".join(f"{k}={v}" for k, v in c["labels"].items())
+                out.append(f"  {c['name']}{f'[{label_text}]' if label_text else ''}: {c['value']}")
+        return "\n".join(out)
+
+    def finish(self, script=None):
+        """Print the summary table and write the configured reports. No-op when disabled."""
+        if not self.enabled:
+            return
+        print("\n" + self.summary_table(script))
+
+        json_path = os.environ.get(ENV_JSON_REPORT)
+        if json_path:
+            try:
+                with open(json_path, "w", encoding="utf-8") as f:
+                    json.dump(self.snapshot(script), f, indent=2)
+                print(f"📝 Metrics report saved to {json_path}")
+            except Exception as e:
+                print(f"❌ Failed to write metrics report: {e}")
+
+        prom_path = os.environ.get(ENV_PROM_REPORT)
+        if prom_path:
+            try:
+                with open(prom_path, "w", encoding="utf-8") as f:
+                    f.write(self.to_prometheus(script))
+                print(f"📝 Prometheus metrics saved to {prom_path}")
+            except Exception as e:
+                print(f"❌ Failed to write Prometheus metrics: {e}")
+
+
+def _enabled_from_env():
+    flag = os.environ.get(ENV_ENABLE, "").strip().lower()
+    if flag in ("1", "true", "yes", "on"):
+        return True
+    return bool(os.environ.get(ENV_JSON_REPORT) or os.environ.get(ENV_PROM_REPORT))
+
+
+# Process-wide instance shared by every script
+metrics = Metrics(enabled=_enabled_from_env())
+if metrics.enabled:
+    metrics._patch_dns()
@@ -0,0 +1,115 @@
+import os
+import urllib.parse
+import uuid
+
+from metrics import metrics
+from transport import create_session, DEFAULT_CONCURRENCY
+
+GITHUB_API_URL = "https://api.github.com"
+APK_CONTENT_TYPE = "application/vnd.android.package-archive"
+
+
+class ReleaseAPIError(Exception):
+    """Raised when the releases API answers with an unexpected status."""
+
+    def __init__(self, action, response):
+        self.status_code = response.status_code
+        super().__init__(f"{action} failed: HTTP {response.status_code} {response.text[:200]}")
+
+
+class ReleasesClient:
+    """
+    Thin GitHub Releases REST client over one pooled, authenticated session.
+    `api_url` can point at GitHub Enterprise or a local fake for testing.
+    """
+
+    def __init__(self, token, repo_name, api_url=GITHUB_API_URL, concurrency=DEFAULT_CONCURRENCY, session=None):
+        self.repo_name = repo_name
+        self.api_url = api_url.rstrip("/")
+        self.session = session or create_session(
+            headers={
+                "Authorization": f"Bearer {token}",
+                "Accept": "application/vnd.github+json",
+                "User-Agent": "OrionStore-Uploader/1.0",
+            },
+            concurrency=concurrency,
+            http2=False,  # uploads stream file objects through requests
+        )
+
+    def _url(self, path):
+        return f"{self.api_url}/repos/{self.repo_name}{path}"
+
+    # --- Releases ---
+    def get_release(self, tag):
+        """Return the release dict for `tag`, or None if it doesn't exist."""
+        r = self.session.get(self._url(f"/releases/tags/{urllib.parse.quote(tag, safe='')}"))
+        if r.status_code == 404:
+            return None
+        if r.status_code != 200:
+            raise ReleaseAPIError(f"Get release '{tag}'", r)
+        return r.json()
+
+    def create_release(self, tag, name, body=""):
+        r = self.session.post(self._url("/releases"), json={
+            "tag_name": tag,
+            "name": name,
+            "body": body,
+            "draft": False,
+            "prerelease": False,
+        })
+        if r.status_code != 201:
+            raise ReleaseAPIError(f"Create release '{tag}'", r)
+        return r.json()
+
+    # --- Assets ---
+    def upload_asset(self, release, filepath, name, content_type=APK_CONTENT_TYPE):
+        """Stream `filepath` from disk into the release under `name` (no in-memory copy)."""
+        upload_url = release["upload_url"].split("{", 1)[0]
+        size = os.path.getsize(filepath)
+        host = urllib.parse.urlsplit(upload_url).hostname
+        with open(filepath, "rb") as f, metrics.timer("upload", host=host):
+            r = self.session.post(
+                upload_url,
+                params={"name": name},
+                data=f,
+                headers={"Content-Type": content_type, "Content-Length": str(size)},
+            )
+        if r.status_code != 201:
+            raise ReleaseAPIError(f"Upload '{name}'", r)
+        metrics.incr("bytes_uploaded", size, host=host)
+        return r.json()
+
+    def rename_asset(self, asset_id, name):
+        r = self.session.patch(self._url(f"/releases/assets/{asset_id}"), json={"name": name})
+        if r.status_code != 200:
+            raise ReleaseAPIError(f"Rename asset {asset_id}", r)
+        return r.json()
+
+    def delete_asset(self, asset_id):
+        r = self.session.delete(self._url(f"/releases/assets/{asset_id}"))
+        if r.status_code not in (204, 404):
+            raise ReleaseAPIError(f"Delete asset {asset_id}", r)
+
+    def replace_asset(self, release, filepath, name, existing_assets, content_type=APK_CONTENT_TYPE):
+        """
+        Replace-by-name without a window where the release has no usable file:
+        upload under a temp name, delete the old asset(s) called `name`, then rename.
+        """
+        temp_name = f"uploading-{uuid.uuid4().hex[:8]}-{name}"
+        uploaded = self.upload_asset(release, filepath, temp_name, content_type)
+        old_removed = False
+        try:
+            for asset in existing_assets:
+                if asset["name"] == name:
+                    self.delete_asset(asset["id"])
+                    old_removed = True
+            return self.rename_asset(uploaded["id"], name)
+        except Exception:
+            # Old asset still there -> drop the orphaned temp upload.
+            # Old asset already gone -> keep the temp upload, it is the only copy left.
+            if not old_removed:
+                try:
+                    self.delete_asset(uploaded["id"])
+                except Exception:
+                    pass
+            raise
@@ -1,12 +1,15 @@
 from utils import setup_session, extract_version_info
+from metrics import metrics
+from transport import DEFAULT_CONCURRENCY
 from bs4 import BeautifulSoup
+import hashlib
 import re
 import time
 import urllib.parse
 
 class GetModsApkScraper:
-    def __init__(self):
-        self.session = setup_session()
+    def __init__(self, concurrency=DEFAULT_CONCURRENCY):
+        self.session = setup_session(concurrency)
         self.base_domain = "https://getmodsapk.com"
     
     def get_download_links(self, base_url):
@@ -189,45 +192,58 @@ class GetModsApkScraper:
     
     def get_current_version(self, base_url):
         """Get current version from the website"""
+        probe = self.probe_version(base_url)
+        return probe['version'] if probe else None
+    
+    def probe_version(self, base_url):
+        """Fetch the page once and return its version plus a SHA-256 fingerprint of the raw HTML"""
         try:
-            response = self.session.get(base_url)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Look for version in multiple places
-            version_pattern = r'v?(\d+\.\d+\.\d+)'
+            host = urllib.parse.urlsplit(base_url).hostname
+            with metrics.timer("fetch_page", host=host):
+                response = self.session.get(base_url)
+                response.raise_for_status()
             
-            # Check page title and headings
-            title = soup.find('title')
-            if title:
-                version_match = re.search(version_pattern, title.get_text(), re.I)
-                if version_match:
-                    return version_match.group(0)
+            fingerprint = hashlib.sha256(response.content).hexdigest()
+            with metrics.timer("parse_html"):
+                soup = BeautifulSoup(response.content, 'html.parser')
             
-            # Check main content
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|main', re.I))
-            if main_content:
-                version_match = re.search(version_pattern, main_content.get_text(), re.I)
-                if version_match:
-                    return version_match.group(0)
-            
-            # Check specific version elements
-            version_elements = soup.find_all(['span', 'div', 'p'], 
-                                           string=re.compile(r'v?\d+\.\d+\.\d+', re.I))
-            for element in version_elements:
-                version = extract_version_info(element.get_text())
-                if version:
-                    return version
-            
-            # Fallback: extract from any text
-            page_text = soup.get_text()
-            version_match = re.search(version_pattern, page_text, re.I)
-            if version_match:
-                return version_match.group(0)
-            
-            return None
+            return {'version': self.find_version(soup), 'fingerprint': fingerprint}
             
         except Exception as e:
             print(f"❌ Error getting current version: {e}")
             return None
+    
+    def find_version(self, soup):
+        """Find the version string in an already parsed page"""
+        # Look for version in multiple places
+        version_pattern = r'v?(\d+\.\d+\.\d+)'
+        
+        # Check page title and headings
+        title = soup.find('title')
+        if title:
+            version_match = re.search(version_pattern, title.get_text(), re.I)
+            if version_match:
+                return version_match.group(0)
+        
+        # Check main content
+        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile(r'content|main', re.I))
+        if main_content:
+            version_match = re.search(version_pattern, main_content.get_text(), re.I)
+            if version_match:
+                return version_match.group(0)
+        
+        # Check specific version elements
+        version_elements = soup.find_all(['span', 'div', 'p'], 
+                                       string=re.compile(r'v?\d+\.\d+\.\d+', re.I))
+        for element in version_elements:
+            version = extract_version_info(element.get_text())
+            if version:
+                return version
+        
+        # Fallback: extract from any text
+        page_text = soup.get_text()
+        version_match = re.search(version_pattern, page_text, re.I)
+        if version_match:
+            return version_match.group(0)
+        
+        return None
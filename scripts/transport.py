@@ -0,0 +1,186 @@
+import os
+import time
+import urllib.parse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from urllib3.util.request import ACCEPT_ENCODING
+
+from metrics import metrics
+
+# Defaults shared by scraper, downloader and mirror generator
+DEFAULT_TIMEOUT = (5, 30)           # (connect, read) seconds
+DEFAULT_CONCURRENCY = 10            # pool size when the caller doesn't say
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+RETRY_TOTAL = 4
+RETRY_BACKOFF = 0.5                 # 0.5s, 1s, 2s, ... (capped by urllib3)
+RETRY_AFTER_MAX = Retry.DEFAULT_BACKOFF_MAX  # longest Retry-After we'll sleep for (seconds)
+ENV_HTTP2 = "ORION_HTTP2"           # "1" -> use httpx + h2 when installed
+
+
+class _CountingRetry(Retry):
+    """urllib3 Retry that reports every retry attempt to the metrics layer."""
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        host = getattr(_pool, "host", None) or "unknown"
+        if response is not None:
+            reason = str(response.status)
+        elif error is not None:
+            reason = type(error).__name__
+        else:
+            reason = "unknown"
+        # super() raises MaxRetryError once exhausted, so only real retries are counted
+        new_retry = super().increment(
+            method=method, url=url, response=response, error=error, _pool=_pool, _stacktrace=_stacktrace
+        )
+        metrics.incr("retries", host=host, reason=reason)
+        return new_retry
+
+    def sleep_for_retry(self, response=None):
+        # urllib3 sleeps for any Retry-After the server sends; cap it like Http2Session does
+        retry_after = self.get_retry_after(response) if response is not None else None
+        if retry_after:
+            time.sleep(min(retry_after, RETRY_AFTER_MAX))
+            return True
+        return False
+
+
+def build_retry(total=RETRY_TOTAL, backoff_factor=RETRY_BACKOFF, statuses=RETRY_STATUSES):
+    """Retry policy: idempotent methods only, honours Retry-After, returns the last response when exhausted."""
+    return _CountingRetry(
+        total=total,
+        connect=total,
+        read=total,
+        status=total,
+        backoff_factor=backoff_factor,
+        status_forcelist=statuses,
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+class TransportSession(requests.Session):
+    """requests.Session that applies a default timeout to every call that doesn't pass one."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT):
+        super().__init__()
+        self.default_timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.default_timeout
+        return super().request(method, url, **kwargs)
+
+
+class Http2Session:
+    """
+    Minimal requests-style wrapper around httpx.Client(http2=True).
+    Only used for JSON API calls (get/post + status_code/json()/content);
+    streaming downloads always go through TransportSession.
+    """
+
+    def __init__(self, httpx, client, retry):
+        self._httpx = httpx
+        self._client = client
+        self._retry = retry
+        self.headers = client.headers
+
+    def request(self, method, url, **kwargs):
+        # Translate the requests-only keyword arguments callers use
+        kwargs.pop("stream", None)
+        if "allow_redirects" in kwargs:
+            kwargs["follow_redirects"] = kwargs.pop("allow_redirects")
+        timeout = kwargs.get("timeout")
+        if isinstance(timeout, tuple):
+            kwargs["timeout"] = self._httpx.Timeout(timeout[1], connect=timeout[0])
+        idempotent = method.upper() in self._retry.allowed_methods
+        attempt = 0
+        while True:
+            retry_after = None
+            try:
+                response = self._client.request(method, url, **kwargs)
+            except self._httpx.TransportError as e:
+                # Connection errors and timeouts, retried like urllib3 does
+                if not (idempotent and attempt < self._retry.total):
+                    raise
+                host, reason = urllib.parse.urlsplit(str(url)).hostname, type(e).__name__
+            else:
+                if not (
+                    response.status_code in self._retry.status_forcelist
+                    and idempotent
+                    and attempt < self._retry.total
+                ):
+                    metrics.record_http(
+                        response.url.host, response.elapsed.total_seconds(), response.status_code, len(response.content)
+                    )
+                    return response
+                host, reason = response.url.host, str(response.status_code)
+                retry_after = response.headers.get("Retry-After")
+            attempt += 1
+            metrics.incr("retries", host=host or "unknown", reason=reason)
+            if retry_after and retry_after.isdigit():
+                delay = int(retry_after)
+            else:
+                delay = self._retry.backoff_factor * (2 ** (attempt - 1))
+            time.sleep(min(delay, RETRY_AFTER_MAX))
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def close(self):
+        self._client.close()
+
+
+def _http2_session(headers, concurrency, timeout, retry):
+    try:
+        import httpx
+        import h2  # noqa: F401  (httpx needs it for http2=True)
+    except ImportError:
+        print("⚠️  HTTP/2 requested but httpx[http2] is not installed - falling back to HTTP/1.1")
+        return None
+
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    client = httpx.Client(
+        http2=True,
+        headers=headers,
+        timeout=httpx.Timeout(read, connect=connect),
+        limits=httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency),
+        follow_redirects=True,
+    )
+    client.headers.setdefault("Accept-Encoding", ACCEPT_ENCODING)
+    return Http2Session(httpx, client, retry)
+
+
+def create_session(headers=None, concurrency=DEFAULT_CONCURRENCY, timeout=DEFAULT_TIMEOUT, retry=None, http2=None):
+    """
+    Build a pooled HTTP session.
+
+    - connection pools sized to `concurrency` (one keep-alive slot per worker)
+    - `timeout` applied to every request that doesn't set its own
+    - retries with exponential backoff on connection errors and 429/5xx
+    - Accept-Encoding advertises every codec urllib3 can decode here
+      (gzip/deflate, plus br/zstd when brotli/zstandard are installed)
+    - http2=True (or ORION_HTTP2=1) swaps in httpx when available
+    """
+    retry = retry or build_retry()
+    concurrency = max(int(concurrency), 1)
+    if http2 is None:
+        http2 = os.environ.get(ENV_HTTP2, "").strip().lower() in ("1", "true", "yes", "on")
+
+    if http2:
+        session = _http2_session(headers or {}, concurrency, timeout, retry)
+        if session is not None:
+            return session
+
+    session = TransportSession(timeout=timeout)
+    adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    if headers:
+        session.headers.update(headers)
+    return metrics.instrument_session(session)
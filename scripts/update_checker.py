@@ -1,30 +1,128 @@
 #!/usr/bin/env python3
+import argparse
+from datetime import datetime, timezone
 from scraper import GetModsApkScraper
-from utils import load_config
+from utils import load_config, normalize_version
+from metrics import metrics
+import json
 import os
+import queue
+import threading
+import time
 
-def check_updates():
-    scraper = GetModsApkScraper()
-    config = load_config()
-    updates_available = False
-    
-    for apk in config['tracked_apks']:
-        print(f"Checking {apk['name']}...")
-        current_version = scraper.get_current_version(apk['base_url'])
-        
-        if current_version and current_version != apk['current_version']:
-            print(f"UPDATE AVAILABLE: {apk['name']} {apk['current_version']} -> {current_version}")
-            updates_available = True
+CHANGES_FILE = 'update-changes.json'
+DEFAULT_WORKERS = 8
+DEFAULT_DEADLINE = 120  # seconds for the whole batch
+
+def probe_all(scraper, apks, workers=DEFAULT_WORKERS, deadline=DEFAULT_DEADLINE):
+    """
+    Probe every tracked page concurrently.
+    Returns (results, timed_out) where results maps APK name -> probe dict (or None on failure).
+    Workers are daemon threads, so probes still running at the deadline are abandoned
+    instead of holding the job open.
+    """
+    pending = queue.Queue()
+    for apk in apks:
+        pending.put(apk)
+    results = {}
+    lock = threading.Lock()
+    stop_at = time.monotonic() + deadline
+
+    def worker():
+        while time.monotonic() < stop_at:
+            try:
+                apk = pending.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                probe = scraper.probe_version(apk['base_url'])
+            except Exception as e:
+                print(f"❌ Probe crashed for {apk['name']}: {e}")
+                probe = None
+            with lock:
+                results[apk['name']] = probe
+
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(max(min(workers, len(apks)), 1))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(max(stop_at - time.monotonic(), 0))
+
+    with lock:
+        finished = dict(results)
+    timed_out = sorted(apk['name'] for apk in apks if apk['name'] not in finished)
+    return finished, timed_out
+
+def build_change_set(apks, results, timed_out):
+    """Compare probe results against the config and describe what changed"""
+    changes = []
+    failed = []
+
+    for apk in apks:
+        if apk['name'] in timed_out:
+            continue
+        probe = results.get(apk['name'])
+        if not probe or not probe['version']:
+            failed.append(apk['name'])
+            print(f"⚠️  Could not determine version for {apk['name']}")
+            continue
+
+        if normalize_version(probe['version']) != normalize_version(apk['current_version']):
+            print(f"UPDATE AVAILABLE: {apk['name']} {apk['current_version']} -> {probe['version']}")
+            changes.append({
+                'name': apk['name'],
+                'release_tag': apk['release_tag'],
+                'base_url': apk['base_url'],
+                'old_version': apk['current_version'],
+                'new_version': probe['version'],
+                'fingerprint': probe['fingerprint'],
+            })
         else:
             print(f"No update for {apk['name']}")
-    
-    # Set output for GitHub Actions
-    if updates_available:
-        print("::set-output name=updates_available::true")
-    else:
-        print("::set-output name=updates_available::false")
-    
-    return updates_available
+
+    for name in timed_out:
+        print(f"⏰ Deadline hit before {name} answered")
+
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'checked': len(apks),
+        'changes': changes,
+        'failed': failed,
+        'timed_out': timed_out,
+    }
+
+def write_github_outputs(change_set):
+    """Publish step outputs via $GITHUB_OUTPUT (replaces the deprecated ::set-output)"""
+    output_path = os.getenv('GITHUB_OUTPUT')
+    if not output_path:
+        return
+    with open(output_path, 'a', encoding='utf-8') as f:
+        f.write(f"updates_available={'true' if change_set['changes'] else 'false'}\n")
+        f.write(f"changes={json.dumps(change_set, separators=(',', ':'))}\n")
+
+def check_updates(output=CHANGES_FILE, workers=DEFAULT_WORKERS, deadline=DEFAULT_DEADLINE):
+    scraper = GetModsApkScraper(concurrency=workers)
+    config = load_config()
+    apks = config['tracked_apks']
+
+    print(f"🔍 Checking {len(apks)} APK(s) with {workers} workers (deadline {deadline}s)...")
+    with metrics.timer("check_all"):
+        results, timed_out = probe_all(scraper, apks, workers, deadline)
+    change_set = build_change_set(apks, results, timed_out)
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(change_set, f, indent=2)
+    print(f"📝 Change set saved to {output} ({len(change_set['changes'])} change(s))")
+
+    write_github_outputs(change_set)
+    metrics.incr("apks_changed", len(change_set['changes']))
+    metrics.finish("update_checker")
+    return bool(change_set['changes'])
 
 if __name__ == "__main__":
-    check_updates()
+    parser = argparse.ArgumentParser(description='Check tracked APK pages for new versions')
+    parser.add_argument('--output', default=CHANGES_FILE, help='Where to write the change set JSON')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Concurrent page probes')
+    parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE, help='Hard deadline in seconds for all probes')
+    args = parser.parse_args()
+    check_updates(args.output, args.workers, args.deadline)
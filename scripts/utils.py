@@ -1,16 +1,18 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 import json
 import os
+from transport import create_session, DEFAULT_CONCURRENCY
 
-def setup_session():
-    """Setup requests session with headers"""
-    session = requests.Session()
-    session.headers.update({
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    })
-    return session
+def setup_session(concurrency=DEFAULT_CONCURRENCY):
+    """Setup pooled, retrying session with browser headers (see transport.create_session)"""
+    return create_session(
+        headers={
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        },
+        concurrency=concurrency,
+        http2=False,  # scraper/downloader stream HTML & APKs through requests
+    )
 
 def extract_version_info(text):
     """Extract version from text"""
@@ -18,6 +20,16 @@ def extract_version_info(text):
     match = re.search(version_pattern, text)
     return match.group(0) if match else None
 
+def normalize_version(version):
+    """Normalize version string for comparison"""
+    if not version:
+        return ""
+    # Remove 'v' prefix and any non-version characters
+    version = re.sub(r'^v', '', str(version).strip())
+    # Keep only version numbers and dots
+    version = re.sub(r'[^\d.]', '', version)
+    return version
+
 def load_config():
     """Load APK configuration"""
     with open('config/apk-list.json', 'r') as f:
@@ -0,0 +1,10 @@
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The scripts import their siblings by module name, as they do in the workflows;
+# ROOT makes the shared fakes in benchmarks/ importable
+for path in (ROOT, os.path.join(ROOT, "scripts"), os.path.join(ROOT, ".github", "scripts")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,148 @@
+"""
+Local stand-in for the GitHub Releases endpoints ReleasesClient uses.
+
+    GET    /repos/<owner>/<repo>/releases/tags/<tag>
+    POST   /repos/<owner>/<repo>/releases
+    POST   /uploads/<release id>/assets?name=<name>
+    PATCH  /repos/<owner>/<repo>/releases/assets/<id>
+    DELETE /repos/<owner>/<repo>/releases/assets/<id>
+
+Every call is appended to `calls` as (verb, asset name) so tests can assert
+the order of operations. Names in `fail_upload` / `fail_rename` /
+`fail_delete` get a 422 (not retried by the transport layer); an upload
+under a temp name ("uploading-<id>-<name>") fails if <name> is listed.
+"""
+import json
+import threading
+import urllib.parse
+
+from benchmarks.local_server import LocalHandler, LocalServer
+
+
+class _Handler(LocalHandler):
+    def _send(self, status, payload=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        self.send_response(status)
+        if body:
+            self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self):
+        return self.rfile.read(int(self.headers.get("Content-Length") or 0))
+
+    def _route(self):
+        split = urllib.parse.urlsplit(self.path)
+        return split.path.strip("/").split("/"), urllib.parse.parse_qs(split.query)
+
+    def do_GET(self):
+        parts, _ = self._route()
+        api = self.server.owner
+        if len(parts) == 6 and parts[3:5] == ["releases", "tags"]:
+            tag = urllib.parse.unquote(parts[5])
+            with api.lock:
+                release = api.releases.get(tag)
+                payload = api.release_payload(release) if release else None
+            return self._send(200, payload) if payload else self._send(404, {"message": "Not Found"})
+        self._send(404, {"message": "Not Found"})
+
+    def do_POST(self):
+        parts, query = self._route()
+        api = self.server.owner
+        body = self._body()
+        if len(parts) == 4 and parts[3] == "releases":
+            data = json.loads(body)
+            with api.lock:
+                release = api.add_release(data["tag_name"])
+                payload = api.release_payload(release)
+            return self._send(201, payload)
+        if len(parts) == 3 and parts[0] == "uploads" and parts[2] == "assets":
+            name = query["name"][0]
+            with api.lock:
+                api.calls.append(("upload", name))
+                if name in api.fail_upload or any(name.endswith(f"-{n}") for n in api.fail_upload):
+                    return self._send(422, {"message": "upload rejected"})
+                asset = api.add_asset(int(parts[1]), name, body)
+            return self._send(201, asset)
+        self._send(404, {"message": "Not Found"})
+
+    def do_PATCH(self):
+        parts, _ = self._route()
+        api = self.server.owner
+        data = json.loads(self._body())
+        with api.lock:
+            asset = api.assets.get(int(parts[-1]))
+            if asset is None:
+                return self._send(404, {"message": "Not Found"})
+            api.calls.append(("rename", data["name"]))
+            if data["name"] in api.fail_rename:
+                return self._send(422, {"message": "rename rejected"})
+            asset["name"] = data["name"]
+            payload = dict(asset)
+        self._send(200, payload)
+
+    def do_DELETE(self):
+        parts, _ = self._route()
+        api = self.server.owner
+        with api.lock:
+            asset = api.assets.get(int(parts[-1]))
+            if asset is None:
+                return self._send(404, {"message": "Not Found"})
+            api.calls.append(("delete", asset["name"]))
+            if asset["name"] in api.fail_delete:
+                return self._send(422, {"message": "delete rejected"})
+            del api.assets[asset["id"]]
+        self._send(204)
+
+
+class FakeReleasesAPI(LocalServer):
+    """Threaded fake releases API with in-memory state; use as a context manager."""
+
+    handler = _Handler
+
+    def __init__(self, host="127.0.0.1", port=0):
+        super().__init__(host=host, port=port)
+        self.lock = threading.Lock()
+        self.releases = {}   # tag -> release id
+        self.assets = {}     # asset id -> {"id", "name", "release_id", "size"}
+        self.contents = {}   # asset id -> uploaded bytes
+        self.calls = []
+        self.fail_upload = set()
+        self.fail_rename = set()
+        self.fail_delete = set()
+        self._next_id = 1
+
+    def _new_id(self):
+        self._next_id += 1
+        return self._next_id
+
+    # --- State helpers (call with or without the lock from tests) ---
+    def add_release(self, tag):
+        release_id = self._new_id()
+        self.releases[tag] = release_id
+        return release_id
+
+    def add_asset(self, release_id, name, content=b""):
+        asset = {"id": self._new_id(), "name": name, "release_id": release_id, "size": len(content)}
+        self.assets[asset["id"]] = asset
+        self.contents[asset["id"]] = content
+        return dict(asset)
+
+    def release_payload(self, release_id):
+        tag = next(t for t, rid in self.releases.items() if rid == release_id)
+        return {
+            "id": release_id,
+            "tag_name": tag,
+            "upload_url": f"{self.url}/uploads/{release_id}/assets{{?name,label}}",
+            "assets": [dict(a) for a in self.assets.values() if a["release_id"] == release_id],
+        }
+
+    def asset_names(self, tag):
+        release_id = self.releases[tag]
+        return sorted(a["name"] for a in self.assets.values() if a["release_id"] == release_id)
+
+    def content_of(self, tag, name):
+        release_id = self.releases[tag]
+        return next(self.contents[a["id"]] for a in self.assets.values()
+                    if a["release_id"] == release_id and a["name"] == name)
@@ -0,0 +1,101 @@
+"""Metrics recording, reports and the disabled no-op path."""
+import json
+
+import metrics as metrics_module
+from metrics import Metrics
+
+
+def _recorded():
+    m = Metrics(enabled=True)
+    with m.timer("fetch", host="api.github.com"):
+        pass
+    m.observe("fetch", 0.5, host="api.github.com")
+    m.observe("parse", 0.25)
+    m.incr("http_requests", host="api.github.com", status="200")
+    m.incr("http_requests", 2, host="api.github.com", status="200")
+    m.incr("shards_written", 7)
+    return m
+
+
+def test_snapshot_aggregates_timers_and_counters():
+    report = _recorded().snapshot("mirror")
+    assert report["script"] == "mirror"
+
+    fetch, parse = report["timers"]
+    assert (fetch["stage"], fetch["host"], fetch["count"]) == ("fetch", "api.github.com", 2)
+    assert fetch["max_s"] == 0.5 and fetch["total_s"] >= 0.5
+    assert (parse["stage"], parse["host"], parse["count"], parse["total_s"]) == ("parse", None, 1, 0.25)
+
+    assert report["counters"] == [
+        {"name": "http_requests", "labels": {"host": "api.github.com", "status": "200"}, "value": 3},
+        {"name": "shards_written", "labels": {}, "value": 7},
+    ]
+    json.dumps(report)  # the JSON report is this dict as-is
+
+
+def test_to_prometheus_format_and_label_escaping():
+    m = _recorded()
+    m.incr("fetch_errors", source='git"lab\\x\nnext')
+    text = m.to_prometheus("mirror")
+
+    assert text.endswith("\n")
+    assert "# TYPE orion_stage_seconds_total counter" in text
+    assert 'orion_stage_calls_total{script="mirror",stage="fetch",host="api.github.com"} 2' in text
+    assert 'orion_http_requests_total{script="mirror",host="api.github.com",status="200"} 3' in text
+    assert 'orion_shards_written_total{script="mirror"} 7' in text
+    assert 'orion_fetch_errors_total{script="mirror",source="git\\"lab\\\\x\\nnext"} 1' in text
+    # Each sample stays on one line
+    assert all(line.startswith(("#", "orion_")) for line in text.splitlines())
+    assert text.count("# TYPE orion_http_requests_total counter") == 1
+
+
+def test_summary_table_lists_stages_and_counters():
+    table = _recorded().summary_table("mirror")
+    lines = table.splitlines()
+    assert lines[0].startswith("⏱️  Run metrics (mirror):")
+    assert lines[1].split() == ["stage", "host", "calls", "total", "(s)", "avg", "(ms)", "max", "(ms)"]
+    assert any(line.split()[:3] == ["fetch", "api.github.com", "2"] for line in lines)
+    assert any(line.split()[:3] == ["parse", "-", "1"] for line in lines)
+    assert "  http_requests[host=api.github.com,status=200]: 3" in lines
+    assert "  shards_written: 7" in lines
+
+
+def test_finish_writes_configured_reports(tmp_path, monkeypatch, capsys):
+    json_path, prom_path = tmp_path / "metrics.json", tmp_path / "metrics.prom"
+    monkeypatch.setenv(metrics_module.ENV_JSON_REPORT, str(json_path))
+    monkeypatch.setenv(metrics_module.ENV_PROM_REPORT, str(prom_path))
+
+    _recorded().finish("mirror")
+
+    assert "Run metrics (mirror)" in capsys.readouterr().out
+    assert json.loads(json_path.read_text())["script"] == "mirror"
+    assert "orion_shards_written_total" in prom_path.read_text()
+
+
+def test_enabled_from_env(monkeypatch):
+    for name in (metrics_module.ENV_ENABLE, metrics_module.ENV_JSON_REPORT, metrics_module.ENV_PROM_REPORT):
+        monkeypatch.delenv(name, raising=False)
+    assert not metrics_module._enabled_from_env()
+    monkeypatch.setenv(metrics_module.ENV_ENABLE, "yes")
+    assert metrics_module._enabled_from_env()
+    monkeypatch.delenv(metrics_module.ENV_ENABLE)
+    monkeypatch.setenv(metrics_module.ENV_PROM_REPORT, "/tmp/x.prom")
+    assert metrics_module._enabled_from_env()
+
+
+def test_disabled_metrics_are_a_no_op(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv(metrics_module.ENV_JSON_REPORT, str(tmp_path / "metrics.json"))
+    m = Metrics()
+    assert m.timer("fetch") is m.timer("parse")  # one shared null timer, nothing allocated
+    with m.timer("fetch", host="x"):
+        pass
+    m.observe("fetch", 1.0)
+    m.incr("http_requests", host="x")
+    m.record_http("x", 0.1, 200, 10)
+
+    report = m.snapshot()
+    assert report["timers"] == [] and report["counters"] == []
+
+    m.finish("mirror")
+    assert capsys.readouterr().out == ""
+    assert not (tmp_path / "metrics.json").exists()
@@ -0,0 +1,59 @@
+"""updates.idx round trip and rejection of damaged files."""
+import pytest
+
+from packed_manifest import HEADER, RECORD, PackedManifest, pack_version, write_manifest
+
+
+@pytest.fixture
+def packed(tmp_path):
+    path = tmp_path / "updates.idx"
+    write_manifest({"com.b": "2.0", "com.a": "1.0", "org.c": "v3"}, str(path))
+    return path
+
+
+def test_round_trip(packed):
+    with PackedManifest(str(packed)) as manifest:
+        assert manifest.get("com.a") == "1.0"
+        assert manifest.get("org.c") == "v3"
+        assert manifest.get("missing") is None
+
+
+@pytest.mark.parametrize("keep", [0, 5, HEADER.size - 1, HEADER.size, HEADER.size + 3])
+def test_truncated_file_raises_value_error(packed, keep):
+    packed.write_bytes(packed.read_bytes()[:keep])
+    with pytest.raises(ValueError):
+        PackedManifest(str(packed))
+
+
+@pytest.mark.parametrize("cut", [1, 3, 8])
+def test_truncated_string_pool_raises_value_error(packed, cut):
+    data = packed.read_bytes()
+    assert len(data) - cut > HEADER.size + 3 * RECORD.size  # cut lands inside the pool
+    packed.write_bytes(data[:-cut])
+    with pytest.raises(ValueError, match="truncated"):
+        PackedManifest(str(packed))
+
+
+def test_trailing_bytes_raise_value_error(packed):
+    packed.write_bytes(packed.read_bytes() + b"junk")
+    with pytest.raises(ValueError):
+        PackedManifest(str(packed))
+
+
+def test_bad_magic_raises_value_error(packed):
+    data = bytearray(packed.read_bytes())
+    data[:4] = b"XXXX"
+    packed.write_bytes(bytes(data))
+    with pytest.raises(ValueError, match="bad magic"):
+        PackedManifest(str(packed))
+
+
+def test_version_parts_above_u16_are_kept(tmp_path):
+    path = tmp_path / "updates.idx"
+    write_manifest({"com.build": "1.70000", "com.date": "2.0.20241015", "com.small": "1.2.3"}, str(path))
+    with PackedManifest(str(path)) as manifest:
+        assert manifest.version_tuple("com.build") == (1, 70000, 0, 0)
+        assert manifest.version_tuple("com.date") == (2, 0, 20241015, 0)
+        assert manifest.version_tuple("com.small") == (1, 2, 3, 0)
+    # Builds that used to collide at the old u16 clamp now compare correctly
+    assert pack_version("1.0.65536") < pack_version("1.0.70000")
@@ -0,0 +1,141 @@
+"""
+Partitioned mirror runs against the fake releases API: run_local() must
+produce exactly what a single generate_mirror() run does, and the merge must
+refuse incomplete or stale partial results before writing anything.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import mirror_generator
+import partitioned_mirror
+from benchmarks.catalog import build_catalog
+from benchmarks.fake_api import FakeReleaseAPI
+from partitioned_mirror import PartitionMergeError, partition_dir, partition_of
+
+APPS = build_catalog(150, seed=4)
+PARTITIONS = 3
+OUTPUTS = ("mirror.json", "updates.bin", "updates.idx")
+
+
+@pytest.fixture(scope="module")
+def api():
+    with FakeReleaseAPI() as fake:
+        yield fake
+
+
+def _workdir(path):
+    path.mkdir()
+    (path / "apps.json").write_text(json.dumps(APPS), encoding="utf-8")
+    return path
+
+
+def _outputs(workdir):
+    files = {name: (workdir / name).read_bytes() for name in OUTPUTS}
+    mirrors = workdir / "mirrors"
+    for path in sorted(mirrors.rglob("*")):
+        if path.is_file():
+            files[str(path.relative_to(workdir))] = path.read_bytes()
+    return files
+
+
+@pytest.fixture
+def partitioned(tmp_path, monkeypatch, api):
+    """A workdir holding finished partial results for every partition (not merged yet)."""
+    workdir = _workdir(tmp_path / "partitioned")
+    monkeypatch.chdir(workdir)
+    for index in range(PARTITIONS):
+        partitioned_mirror.run_partition(index, PARTITIONS, github_api_url=api.url, gitlab_api_url=api.url)
+    return workdir
+
+
+def _partial(index):
+    return os.path.join(partition_dir(index, PARTITIONS), partitioned_mirror.PARTIAL_FILE)
+
+
+def _edit_partial(index, edit):
+    with open(_partial(index), "r", encoding="utf-8") as f:
+        partial = json.load(f)
+    edit(partial)
+    with open(_partial(index), "w", encoding="utf-8") as f:
+        json.dump(partial, f)
+
+
+def _assert_merge_fails(match):
+    with pytest.raises(PartitionMergeError, match=match):
+        partitioned_mirror.merge_partitions(PARTITIONS)
+    # Validation happens before any output is touched
+    assert not any(os.path.exists(name) for name in OUTPUTS + ("mirrors",))
+
+
+def test_run_local_matches_single_run(tmp_path, monkeypatch, api):
+    single = _workdir(tmp_path / "single")
+    monkeypatch.chdir(single)
+    mirror_generator.generate_mirror(github_api_url=api.url, gitlab_api_url=api.url)
+
+    local = _workdir(tmp_path / "local")
+    monkeypatch.chdir(local)
+    partitioned_mirror.run_local(PARTITIONS, github_api_url=api.url, gitlab_api_url=api.url)
+
+    expected = _outputs(single)
+    assert len(expected) > len(OUTPUTS)  # shards were written
+    assert _outputs(local) == expected
+
+
+def test_merge_can_be_rerun(partitioned):
+    partitioned_mirror.merge_partitions(PARTITIONS)
+    first = _outputs(partitioned)
+    partitioned_mirror.merge_partitions(PARTITIONS)
+    assert _outputs(partitioned) == first
+
+
+def test_merge_fails_on_missing_partial(partitioned):
+    os.remove(_partial(1))
+    _assert_merge_fails(r"partition 1: .*partial\.json missing")
+
+
+def test_merge_fails_on_different_catalog(partitioned):
+    _edit_partial(0, lambda partial: partial.update(catalog_sha256="0" * 64))
+    _assert_merge_fails("partition 0: built from a different apps.json")
+
+
+def test_merge_fails_on_repo_missing_from_its_partition(partitioned):
+    removed = []
+
+    def drop_repo(partial):
+        key = sorted(partial["repos"])[0]
+        removed.append(key)
+        del partial["repos"][key]
+
+    _edit_partial(2, drop_repo)
+    _assert_merge_fails(f"partition 2: no result for {removed[0]}")
+
+
+def test_merge_fails_on_missing_shard(partitioned):
+    shards_root = os.path.join(partition_dir(0, PARTITIONS), mirror_generator.MIRRORS_DIR)
+    dirpath, _, filenames = next(w for w in os.walk(shards_root) if w[2])
+    os.remove(os.path.join(dirpath, filenames[0]))
+    _assert_merge_fails(r"partition 0: shard .* missing")
+
+
+def test_partition_of_is_stable():
+    keys = ["github::gitlab.com::foo/bar", "gitlab::gitlab.com::a/b", "github::gitlab.com::orion/store"]
+    assert [partition_of(k, 4) for k in keys] == [1, 3, 0]
+    for key in keys:
+        digest = int(hashlib.sha1(key.encode("utf-8")).hexdigest()[:16], 16)
+        assert partition_of(key, 7) == digest % 7
+
+    # Independent of the interpreter's hash seed (unlike hash())
+    code = f"import partitioned_mirror as p; print([p.partition_of(k, 4) for k in {keys!r}])"
+    for seed in ("1", "2"):
+        out = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=os.path.dirname(partitioned_mirror.__file__),
+            env={**os.environ, "PYTHONHASHSEED": seed},
+            capture_output=True, text=True, check=True,
+        ).stdout
+        assert out.strip() == "[1, 3, 0]"
@@ -0,0 +1,109 @@
+"""
+ReleasesClient.replace_asset and APKDownloader.upload_batch against a local
+fake releases API.
+"""
+import pytest
+
+from downloader import APKDownloader
+from fake_releases import FakeReleasesAPI
+from releases import ReleaseAPIError, ReleasesClient
+
+REPO = "orion/apks"
+
+
+@pytest.fixture
+def api():
+    with FakeReleasesAPI() as fake:
+        yield fake
+
+
+def _apk(tmp_path, name, fill=b"N"):
+    path = tmp_path / name
+    path.write_bytes(fill * 4096)  # upload_batch rejects files under 1 KB
+    return str(path)
+
+
+def _client(api):
+    return ReleasesClient("token", REPO, api_url=api.url)
+
+
+def test_replace_asset_uploads_temp_then_deletes_then_renames(api, tmp_path):
+    release_id = api.add_release("app")
+    api.add_asset(release_id, "app.apk", b"old")
+    filepath = _apk(tmp_path, "app.apk")
+
+    client = _client(api)
+    release = client.get_release("app")
+    client.replace_asset(release, filepath, "app.apk", release["assets"])
+
+    verbs = [verb for verb, _ in api.calls]
+    assert verbs == ["upload", "delete", "rename"]
+    temp_name = api.calls[0][1]
+    assert temp_name.startswith("uploading-") and temp_name.endswith("-app.apk")
+    assert api.calls[1] == ("delete", "app.apk")
+    assert api.calls[2] == ("rename", "app.apk")
+    assert api.asset_names("app") == ["app.apk"]
+    assert api.content_of("app", "app.apk") == b"N" * 4096
+
+
+def test_failed_rename_after_delete_keeps_temp_asset(api, tmp_path):
+    release_id = api.add_release("app")
+    api.add_asset(release_id, "app.apk", b"old")
+    api.fail_rename.add("app.apk")
+    filepath = _apk(tmp_path, "app.apk")
+
+    client = _client(api)
+    release = client.get_release("app")
+    with pytest.raises(ReleaseAPIError):
+        client.replace_asset(release, filepath, "app.apk", release["assets"])
+
+    # The old asset is gone, so the temp upload is the only copy left
+    names = api.asset_names("app")
+    assert len(names) == 1 and names[0].startswith("uploading-")
+
+
+def test_failed_delete_drops_temp_asset_and_keeps_old(api, tmp_path):
+    release_id = api.add_release("app")
+    api.add_asset(release_id, "app.apk", b"old")
+    api.fail_delete.add("app.apk")
+    filepath = _apk(tmp_path, "app.apk")
+
+    client = _client(api)
+    release = client.get_release("app")
+    with pytest.raises(ReleaseAPIError):
+        client.replace_asset(release, filepath, "app.apk", release["assets"])
+
+    assert api.asset_names("app") == ["app.apk"]
+    assert api.content_of("app", "app.apk") == b"old"
+
+
+def test_upload_batch_prunes_only_fully_uploaded_tags(api, tmp_path):
+    good = api.add_release("good")
+    api.add_asset(good, "good-1.0.apk", b"old")
+    bad = api.add_release("bad")
+    api.add_asset(bad, "bad-1.0.apk", b"old")
+    api.fail_upload.add("bad-b-2.0.apk")
+
+    items = [
+        ("good", _apk(tmp_path, "good-2.0.apk"), "2.0"),
+        ("bad", _apk(tmp_path, "bad-a-2.0.apk"), "2.0"),
+        ("bad", _apk(tmp_path, "bad-b-2.0.apk"), "2.0"),
+    ]
+    results = APKDownloader("token", api_url=api.url).upload_batch(REPO, items, max_workers=2)
+
+    assert results == {items[0][1]: True, items[1][1]: True, items[2][1]: False}
+    assert api.asset_names("good") == ["good-2.0.apk"]
+    # One upload for "bad" failed: its old asset must survive
+    assert api.asset_names("bad") == ["bad-1.0.apk", "bad-a-2.0.apk"]
+
+
+def test_upload_batch_creates_missing_release_once(api, tmp_path):
+    items = [
+        ("new", _apk(tmp_path, "new-a.apk"), "1.0"),
+        ("new", _apk(tmp_path, "new-b.apk"), "1.0"),
+    ]
+    results = APKDownloader("token", api_url=api.url).upload_batch(REPO, items)
+
+    assert all(results.values())
+    assert list(api.releases) == ["new"]
+    assert api.asset_names("new") == ["new-a.apk", "new-b.apk"]
@@ -0,0 +1,156 @@
+"""
+create_session() against a flaky local server: retries on 429/5xx,
+Retry-After, exhaustion, gzip decoding and the default timeout.
+"""
+import gzip
+import json
+import socket
+import sys
+import threading
+import time
+
+import pytest
+import requests
+
+import transport
+from benchmarks.local_server import LocalHandler, LocalServer
+from metrics import metrics
+from transport import RETRY_TOTAL, build_retry, create_session
+
+
+class _FlakyHandler(LocalHandler):
+    def _send(self, status, body=b'{"ok":true}', headers=()):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server.owner
+        with server.lock:
+            hits = server.hits[self.path] = server.hits.get(self.path, 0) + 1
+            server.seen_headers[self.path] = dict(self.headers)
+
+        if self.path == "/flaky-503":
+            self._send(503 if hits == 1 else 200)
+        elif self.path == "/flaky-429":
+            self._send(429, headers=[("Retry-After", "1")]) if hits == 1 else self._send(200)
+        elif self.path == "/retry-after-hour":
+            self._send(503, headers=[("Retry-After", "3600")]) if hits == 1 else self._send(200)
+        elif self.path == "/always-500":
+            self._send(500, b'{"message":"boom"}')
+        elif self.path == "/gzip":
+            self._send(200, gzip.compress(json.dumps({"releases": [1, 2, 3]}).encode()), [("Content-Encoding", "gzip")])
+        elif self.path == "/slow":
+            time.sleep(0.5)
+            self._send(200)
+        else:
+            self._send(404, b'{"message":"Not Found"}')
+
+
+@pytest.fixture
+def server():
+    local = LocalServer(_FlakyHandler)
+    local.lock = threading.Lock()
+    local.hits = {}
+    local.seen_headers = {}
+    with local:
+        yield local
+
+
+@pytest.fixture
+def counters(monkeypatch):
+    """Enable the metrics layer with empty counters; returns a name -> total reader."""
+    monkeypatch.setattr(metrics, "enabled", True)
+    monkeypatch.setattr(metrics, "_counters", {})
+
+    def total(name):
+        return sum(value for (key, _), value in metrics._counters.items() if key == name)
+    return total
+
+
+def _fast_session(**kwargs):
+    # No backoff sleeps, so the suite stays quick; Retry-After is still honoured
+    return create_session(retry=build_retry(backoff_factor=0), **kwargs)
+
+
+def test_retries_503_then_succeeds(server, counters):
+    r = _fast_session().get(f"{server.url}/flaky-503")
+    assert r.status_code == 200
+    assert server.hits["/flaky-503"] == 2
+    assert counters("retries") == 1
+
+
+def test_retries_429_and_honours_retry_after(server, counters):
+    start = time.monotonic()
+    r = _fast_session().get(f"{server.url}/flaky-429")
+    elapsed = time.monotonic() - start
+    assert r.status_code == 200
+    assert server.hits["/flaky-429"] == 2
+    assert elapsed >= 0.9
+    assert counters("retries") == 1
+
+
+def test_retry_after_is_capped(server, monkeypatch):
+    monkeypatch.setattr(transport, "RETRY_AFTER_MAX", 0.2)
+    start = time.monotonic()
+    r = _fast_session().get(f"{server.url}/retry-after-hour")
+    assert r.status_code == 200
+    assert server.hits["/retry-after-hour"] == 2
+    assert time.monotonic() - start < 5
+
+
+def test_exhausted_retries_return_last_response(server, counters):
+    r = _fast_session().get(f"{server.url}/always-500")
+    assert r.status_code == 500
+    assert r.json() == {"message": "boom"}
+    assert server.hits["/always-500"] == RETRY_TOTAL + 1
+    assert counters("retries") == RETRY_TOTAL
+
+
+def test_gzip_body_is_decoded(server):
+    r = _fast_session().get(f"{server.url}/gzip")
+    assert r.status_code == 200
+    assert r.json() == {"releases": [1, 2, 3]}
+    assert "gzip" in server.seen_headers["/gzip"]["Accept-Encoding"]
+
+
+def test_default_timeout_applies_when_caller_passes_none(server):
+    session = create_session(timeout=0.1, retry=build_retry(total=0))
+    with pytest.raises(requests.exceptions.RequestException):
+        session.get(f"{server.url}/slow")
+    # An explicit timeout still wins over the default
+    assert session.get(f"{server.url}/slow", timeout=5).status_code == 200
+
+
+def test_http2_falls_back_when_httpx_is_missing(monkeypatch):
+    monkeypatch.setitem(sys.modules, "httpx", None)  # makes `import httpx` raise ImportError
+    assert isinstance(create_session(http2=True), transport.TransportSession)
+
+
+def test_http2_session_retries_status_and_records_requests(server, counters):
+    pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    session = create_session(http2=True, retry=build_retry(backoff_factor=0))
+    assert isinstance(session, transport.Http2Session)
+    r = session.get(f"{server.url}/flaky-503")
+    assert r.status_code == 200
+    assert server.hits["/flaky-503"] == 2
+    assert counters("retries") == 1
+    assert counters("http_requests") == 1
+    assert counters("bytes_received") == len(b'{"ok":true}')
+
+
+def test_http2_session_retries_connection_errors(counters):
+    httpx = pytest.importorskip("httpx")
+    pytest.importorskip("h2")
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]  # closed again before the request: connection refused
+    session = create_session(http2=True, retry=build_retry(backoff_factor=0))
+    with pytest.raises(httpx.TransportError):
+        session.get(f"http://127.0.0.1:{port}/")
+    assert counters("retries") == RETRY_TOTAL
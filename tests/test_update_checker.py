@@ -0,0 +1,185 @@
+"""
+update_checker.py probes and change set, and main.py --changes consuming it
+(the contract between the check and scrape workflows).
+"""
+import json
+import sys
+import time
+
+import pytest
+
+import main as main_script
+import update_checker
+
+
+def _apk(name, version, url=None):
+    return {
+        "name": name,
+        "base_url": url or f"https://example.test/{name}",
+        "current_version": version,
+        "release_tag": f"{name}-tag",
+    }
+
+
+class StubScraper:
+    """probe_version answers from a table: a version string, None, an exception, or (seconds, version)."""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.probed = []
+
+    def probe_version(self, url):
+        self.probed.append(url)
+        answer = self.answers[url]
+        if isinstance(answer, tuple):
+            time.sleep(answer[0])
+            answer = answer[1]
+        if isinstance(answer, Exception):
+            raise answer
+        if answer is None:
+            return None
+        return {"version": answer, "fingerprint": f"fp-{answer}"}
+
+
+APKS = [
+    _apk("fresh", "v1.2.0"),     # update available
+    _apk("same", "1.0.0"),       # site says "v1.0.0": equal once normalized
+    _apk("broken", "2.0"),       # probe returns None
+    _apk("crashes", "3.0"),      # probe raises
+    _apk("slow", "4.0"),         # still running at the deadline
+]
+
+ANSWERS = {
+    "https://example.test/fresh": "1.3.0",
+    "https://example.test/same": "v1.0.0",
+    "https://example.test/broken": None,
+    "https://example.test/crashes": RuntimeError("boom"),
+    "https://example.test/slow": (3, "5.0"),
+}
+
+
+def test_probe_all_separates_finished_failed_and_timed_out():
+    start = time.monotonic()
+    results, timed_out = update_checker.probe_all(StubScraper(ANSWERS), APKS, workers=5, deadline=0.5)
+    assert time.monotonic() - start < 2  # the slow probe is abandoned, not waited for
+
+    assert timed_out == ["slow"]
+    assert results["fresh"] == {"version": "1.3.0", "fingerprint": "fp-1.3.0"}
+    assert results["broken"] is None
+    assert results["crashes"] is None  # a crashing probe counts as failed, not timed out
+    assert "slow" not in results
+
+
+def test_probe_all_stops_handing_out_work_after_the_deadline():
+    apks = [_apk(f"app{i}", "1.0") for i in range(6)]
+    scraper = StubScraper({apk["base_url"]: (0.4, "1.0") for apk in apks})
+    results, timed_out = update_checker.probe_all(scraper, apks, workers=1, deadline=0.6)
+    # One worker: app0 done at ~0.4s, app1 started before 0.6s and abandoned, the rest never probed
+    assert len(scraper.probed) == 2
+    assert set(results) == {"app0"}
+    assert timed_out == [f"app{i}" for i in range(1, 6)]
+
+
+def test_build_change_set_compares_normalized_versions():
+    results, timed_out = update_checker.probe_all(StubScraper(ANSWERS), APKS, workers=5, deadline=0.5)
+    change_set = update_checker.build_change_set(APKS, results, timed_out)
+
+    assert change_set["checked"] == 5
+    assert change_set["changes"] == [{
+        "name": "fresh",
+        "release_tag": "fresh-tag",
+        "base_url": "https://example.test/fresh",
+        "old_version": "v1.2.0",
+        "new_version": "1.3.0",
+        "fingerprint": "fp-1.3.0",
+    }]
+    assert change_set["failed"] == ["broken", "crashes"]
+    assert change_set["timed_out"] == ["slow"]
+
+
+def test_write_github_outputs(tmp_path, monkeypatch):
+    output = tmp_path / "github_output"
+    output.write_text("earlier=1\n")
+    monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+    change_set = {"checked": 1, "changes": [{"name": "fresh", "new_version": "1.3.0"}], "failed": [], "timed_out": []}
+
+    update_checker.write_github_outputs(change_set)
+
+    lines = output.read_text().splitlines()
+    assert lines[0] == "earlier=1"  # appended, never truncated
+    assert lines[1] == "updates_available=true"
+    key, _, value = lines[2].partition("=")
+    assert key == "changes" and json.loads(value) == change_set
+    assert len(lines) == 3  # compact JSON: one line per output
+
+
+def test_write_github_outputs_without_env_is_a_no_op(tmp_path, monkeypatch):
+    monkeypatch.delenv("GITHUB_OUTPUT", raising=False)
+    monkeypatch.chdir(tmp_path)
+    update_checker.write_github_outputs({"changes": []})
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_check_updates_writes_change_set_and_outputs(tmp_path, monkeypatch):
+    monkeypatch.setattr(update_checker, "GetModsApkScraper", lambda concurrency: StubScraper(ANSWERS))
+    monkeypatch.setattr(update_checker, "load_config", lambda: {"tracked_apks": APKS})
+    monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / "github_output"))
+    output = tmp_path / "update-changes.json"
+
+    assert update_checker.check_updates(str(output), workers=5, deadline=0.5) is True
+
+    change_set = json.loads(output.read_text())
+    assert [c["name"] for c in change_set["changes"]] == ["fresh"]
+    assert change_set["timed_out"] == ["slow"]
+    assert "updates_available=true" in (tmp_path / "github_output").read_text()
+
+
+class RecordingScraper:
+    def __init__(self, *args, **kwargs):
+        self.version_checks = []
+        self.download_lookups = []
+        RecordingScraper.last = self
+
+    def get_current_version(self, url):
+        self.version_checks.append(url)
+        return None
+
+    def get_download_links(self, url):
+        self.download_lookups.append(url)
+        return None  # stop before downloading
+
+
+@pytest.fixture
+def main_stubs(monkeypatch):
+    monkeypatch.setattr(main_script, "GetModsApkScraper", RecordingScraper)
+    monkeypatch.setattr(main_script, "load_config", lambda: {"tracked_apks": APKS})
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+
+
+def test_main_changes_only_processes_listed_apks(tmp_path, monkeypatch, main_stubs):
+    changes = tmp_path / "update-changes.json"
+    changes.write_text(json.dumps({"changes": [{"name": "fresh", "new_version": "1.3.0"}]}))
+    monkeypatch.setattr(sys, "argv", ["main.py", "--auto", "--changes", str(changes)])
+
+    main_script.main()
+
+    scraper = RecordingScraper.last
+    assert scraper.version_checks == []  # the checker's version is reused
+    assert scraper.download_lookups == ["https://example.test/fresh"]
+
+
+def test_main_without_changes_checks_every_apk(monkeypatch, main_stubs):
+    monkeypatch.setattr(sys, "argv", ["main.py", "--auto"])
+    main_script.main()
+    assert RecordingScraper.last.version_checks == [apk["base_url"] for apk in APKS]
+
+
+def test_load_change_set_keys_by_name(tmp_path):
+    path = tmp_path / "update-changes.json"
+    path.write_text(json.dumps({"changes": [{"name": "a", "new_version": "1"}, {"name": "b", "new_version": "2"}]}))
+    assert main_script.load_change_set(str(path)) == {
+        "a": {"name": "a", "new_version": "1"},
+        "b": {"name": "b", "new_version": "2"},
+    }
+    path.write_text(json.dumps({"checked": 0}))
+    assert main_script.load_change_set(str(path)) == {}